@@ -0,0 +1,379 @@
+## Headless wall-clock benchmark: every generator x array size x search,
+## reported as JSON (queries/sec, p50/p99 latency, fit time, peak memory
+## of building the array and of each fit or batched search) and optionally compared against a saved baseline as a release gate.
+##
+##   PYTHONPATH=src python experiments/benchmark_suite.py --out bench.json
+##   PYTHONPATH=src python experiments/benchmark_suite.py --baseline bench.json
+##
+## Exits with status 1 when a result regresses past --tolerance.
+
+import argparse
+import bisect
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import os
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+import numpy as np
+
+import kaps
+from kaps import base_kaps, dd_kaps, lkaps, lkaps_fit, lkaps_to_G
+from kaps.generators import *
+from kaps.baselines import (
+    binary_search, interpolation_search, interpolation_sequential_search, exponential_search,
+    binary_search_batch, interpolation_search_batch, exponential_search_batch,
+)
+
+
+GENERATORS = {
+    "uniform": gen_uniform,
+    "zipf": gen_zipf,
+    "normal": gen_normal,
+    "exponential": gen_exponential,
+    "lognormal": gen_lognormal,
+    "pareto": gen_pareto,
+    "weibull": gen_weibull,
+    "logistic": gen_logistic,
+    "zipf_pareto": gen_zipf_pareto,
+}
+
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7, 10**8]
+QUICK_SIZES = [10**3, 10**4, 10**5]
+
+# Searches called once per target: name -> f(arr, G, target) -> anything
+SCALAR_SEARCHES = {
+    "base_kaps": lambda arr, G, t: base_kaps(0, len(arr) - 1, arr, t, 10, 2),
+    "dd_kaps": lambda arr, G, t: dd_kaps(0, len(arr) - 1, arr, t, 20, 2, G),
+    "binary_search": lambda arr, G, t: binary_search(arr, 0, len(arr) - 1, t),
+    "interpolation_search": lambda arr, G, t: interpolation_search(arr, 0, len(arr) - 1, t),
+    "interpolation_sequential_search":
+        lambda arr, G, t: interpolation_sequential_search(arr, 0, len(arr) - 1, t),
+    "exponential_search": lambda arr, G, t: exponential_search(arr, 0, len(arr) - 1, t),
+    "bisect": lambda arr, G, t: bisect.bisect_left(arr, t),
+    "np.searchsorted": lambda arr, G, t: np.searchsorted(arr, t),
+}
+
+# Largest array each search runs on; its probe walk is linear on skewed
+# keys (~60 ms per query at 1e6 Pareto keys), so larger sizes never finish
+SIZE_LIMITS = {
+    "interpolation_sequential_search": 10**5,
+}
+
+# Regression gate: absolute changes below these are treated as noise,
+# and p99 is only compared when both runs had at least MIN_P99_QUERIES
+NOISE_FLOORS = {
+    "p50_ns": 500,
+    "p99_ns": 2000,
+    "fit_s": 0.005,
+    "peak_mem_bytes": 4096,
+}
+MIN_P99_QUERIES = 500
+
+# Fits taking longer than this (s) are timed once instead of best-of-repeats
+FIT_REPEAT_LIMIT_S = 1.0
+
+# Searches over the whole target array at once: name -> f(arr, key, targets)
+BATCH_SEARCHES = {
+    "np.searchsorted[batch]": lambda arr, key, ts: np.searchsorted(arr, ts),
+    "binary_search[batch]": lambda arr, key, ts: binary_search_batch(arr, ts),
+    "interpolation_search[batch]": lambda arr, key, ts: interpolation_search_batch(arr, ts),
+    "exponential_search[batch]": lambda arr, key, ts: exponential_search_batch(arr, ts),
+    "kaps.searchsorted[batch]": lambda arr, key, ts: kaps.searchsorted(arr, ts, model=key),
+}
+
+# Model selection, timed and memory-profiled: name -> f(arr) -> (key, value)
+FITS = {
+    "lkaps": lkaps,
+    "lkaps_fit": lkaps_fit,
+}
+
+
+# ---------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------
+# Every timing is best-of-N: scheduler and cache noise only ever adds
+# time, so the minimum is the most repeatable estimate. Each timer below
+# returns (run, row): run() times one pass, row() reports the best so far.
+def time_scalar(search, arr, G, targets):
+    lat = np.full(len(targets), np.iinfo(np.int64).max, dtype=np.int64)
+    clock = time.perf_counter_ns
+    best_total = [float("inf")]
+
+    def run():
+        once = np.empty(len(targets), dtype=np.int64)
+        for i, t in enumerate(targets):
+            start = clock()
+            search(arr, G, t)
+            once[i] = clock() - start
+        np.minimum(lat, once, out=lat)      # per-query best across runs
+        best_total[0] = min(best_total[0], once.sum() / 1e9)
+
+    def row():
+        return {
+            "qps": len(targets) / best_total[0] if best_total[0] > 0 else None,
+            "p50_ns": float(np.percentile(lat, 50)),
+            "p99_ns": float(np.percentile(lat, 99)),
+            "queries": len(targets),
+        }
+    return run, row
+
+
+def time_batch(search, arr, key, targets):
+    best = [float("inf")]
+
+    def run():
+        start = time.perf_counter()
+        search(arr, key, targets)
+        best[0] = min(best[0], time.perf_counter() - start)
+
+    def row():
+        return {
+            "qps": targets.size / best[0] if best[0] > 0 else None,
+            "p50_ns": None,
+            "p99_ns": None,
+            "queries": int(targets.size),
+        }
+    return run, row
+
+
+def time_fit(fit, arr):
+    best = [float("inf")]
+
+    def run():
+        # Fits slower than FIT_REPEAT_LIMIT_S run once: their noise is relatively small
+        if FIT_REPEAT_LIMIT_S < best[0] < float("inf"):
+            return
+        start = time.perf_counter()
+        fit(arr)
+        best[0] = min(best[0], time.perf_counter() - start)
+
+    return run, lambda: {"fit_s": best[0]}
+
+
+def run_interleaved(runs, repeats, min_time):
+    # One run of every timer per round, until there have been `repeats`
+    # rounds and about `min_time` seconds per timer. Slow phases on shared
+    # machines can last seconds; interleaving makes one cost each timer a
+    # round instead of every run of whichever timer was unlucky.
+    deadline = time.perf_counter() + min_time * len(runs)
+    rounds = 0
+    while rounds < repeats or time.perf_counter() < deadline:
+        for run in runs:
+            run()
+        rounds += 1
+
+
+def traced_peak(f, *args):
+    # Peak bytes allocated while f(*args) runs, on top of what already exists
+    tracemalloc.start()
+    try:
+        f(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_array(gen_name, size, trace_memory):
+    # Returns (arr, peak bytes while building it, or None when not traced)
+    if not trace_memory:
+        return np.asarray(GENERATORS[gen_name](size)), None
+    tracemalloc.start()
+    try:
+        arr = np.asarray(GENERATORS[gen_name](size))
+        return arr, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(gen_name, size, n_queries, searches, seed, trace_memory=True, repeats=5,
+             min_time=1.0):
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    arr, build_peak = build_array(gen_name, size, trace_memory)
+
+    targets = arr[rng.integers(0, arr.size, n_queries)]
+    target_list = targets.tolist()
+    case = {"generator": gen_name, "size": size}
+    timers = []                             # (name, run, row, extra fields)
+
+    keys = {}
+    for name, fit in FITS.items():
+        if name not in searches and not (name == "lkaps" and "dd_kaps" in searches):
+            continue
+        keys[name] = fit(arr)[0]
+        extra = {"key": _json_key(keys[name])}
+        # Separate traced run: tracemalloc sees NumPy buffers as well as Python
+        # objects, but slows allocation-heavy fits (lkaps) by ~10x
+        if trace_memory:
+            extra["build_peak_bytes"] = build_peak
+            extra["peak_mem_bytes"] = traced_peak(fit, arr)
+        timers.append((name, *time_fit(fit, arr), extra))
+
+    # dd_kaps runs on the full lkaps choice, like comparative_analysis.py
+    G = lkaps_to_G(arr, keys["lkaps"]) if "lkaps" in keys else None
+
+    for name, search in SCALAR_SEARCHES.items():
+        if name in searches and size <= SIZE_LIMITS.get(name, size):
+            timers.append((name, *time_scalar(search, arr, G, target_list), {}))
+
+    for name, search in BATCH_SEARCHES.items():
+        if name in searches:
+            key = keys.get("lkaps_fit") or lkaps_fit(arr)[0]
+            extra = {}
+            if trace_memory:
+                extra["build_peak_bytes"] = build_peak
+                extra["peak_mem_bytes"] = traced_peak(search, arr, key, targets)
+            timers.append((name, *time_batch(search, arr, key, targets), extra))
+
+    run_interleaved([run for _, run, _, _ in timers], repeats, min_time)
+    return [dict(case, search=name, **row(), **extra) for name, _, row, extra in timers]
+
+
+def _json_key(key):
+    return [p.item() if isinstance(p, np.generic) else p for p in key]
+
+
+# ---------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------
+def compare(results, baseline, tolerance):
+    """
+    Lists every metric that got worse than the baseline by more than
+    `tolerance` (a fraction): lower qps, or higher p50/p99/fit time or
+    peak_mem_bytes (build_peak_bytes is not gated). Changes smaller than the metric's NOISE_FLOORS entry
+    are ignored, and so is p99 when either run had fewer than
+    MIN_P99_QUERIES queries (its p99 is then one or two samples).
+    """
+    ident = lambda r: (r["generator"], r["size"], r["search"])
+    base = {ident(r): r for r in baseline["results"]}
+
+    regressions = []
+    for r in results:
+        b = base.get(ident(r))
+        if b is None:
+            continue
+        for metric, higher_is_better in (("qps", True), ("p50_ns", False), ("p99_ns", False),
+                                         ("fit_s", False), ("peak_mem_bytes", False)):
+            new, old = r.get(metric), b.get(metric)
+            if new is None or old is None or old == 0:
+                continue
+            if abs(new - old) < NOISE_FLOORS.get(metric, 0):
+                continue
+            if metric == "p99_ns" and min(r.get("queries", 0), b.get("queries", 0)) < MIN_P99_QUERIES:
+                continue
+            change = (new - old) / old
+            worse = change < -tolerance if higher_is_better else change > tolerance
+            if worse:
+                regressions.append({"case": list(ident(r)), "metric": metric,
+                                    "baseline": old, "current": new, "change": change})
+    return regressions
+
+
+def merge_best(results, rerun):
+    # Per metric, the better of two measurements of the same cases
+    ident = lambda r: (r["generator"], r["size"], r["search"])
+    again = {ident(r): r for r in rerun}
+    merged = []
+    for r in results:
+        r2 = again.get(ident(r))
+        if r2 is not None:
+            r = dict(r)
+            for metric, pick in (("qps", max), ("p50_ns", min), ("p99_ns", min), ("fit_s", min)):
+                if r.get(metric) is not None and r2.get(metric) is not None:
+                    r[metric] = pick(r[metric], r2[metric])
+        merged.append(r)
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless KAPS wall-clock benchmark")
+    parser.add_argument("--sizes", type=lambda s: [int(float(v)) for v in s.split(",")],
+                        help="comma-separated array sizes (default 1e3..1e8)")
+    parser.add_argument("--quick", action="store_true", help="sizes 1e3..1e5 only")
+    parser.add_argument("--generators", default=",".join(GENERATORS))
+    parser.add_argument("--searches",
+                        default=",".join(list(FITS) + list(SCALAR_SEARCHES) + list(BATCH_SEARCHES)))
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results JSON here (e.g. to save a new baseline)")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="minimum timing runs per measurement; the best one is reported")
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="keep repeating for about this many seconds per measurement")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="re-time cases that regress this many times before failing")
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false",
+                        help="skip the tracemalloc reruns that measure peak_mem_bytes")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    searches = set(args.searches.split(","))
+
+    results = []
+    for size in sizes:
+        for gen_name in args.generators.split(","):
+            print(f"{gen_name:>12} n={size:<10}", file=sys.stderr, flush=True)
+            results.extend(run_case(gen_name, size, args.queries, searches, args.seed,
+                                    args.trace_memory, args.repeats, args.min_time))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "queries": args.queries,
+            "repeats": args.repeats,
+            "min_time": args.min_time,
+            "retries": args.retries,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        # A machine-wide slow phase can outlast a whole case, so regressed
+        # cases are timed again later; a real regression shows up both times
+        for _ in range(args.retries):
+            if not regressions:
+                break
+            for gen_name, size in sorted({(r["case"][0], r["case"][1]) for r in regressions}):
+                print(f"{gen_name:>12} n={size:<10} (retry)", file=sys.stderr, flush=True)
+                results = merge_best(results, run_case(gen_name, size, args.queries, searches,
+                                                       args.seed, False, args.repeats,
+                                                       args.min_time))
+            regressions = compare(results, baseline, args.tolerance)
+        report["results"] = results
+        report["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        for reg in report["regressions"]:
+            print(f"REGRESSION {'/'.join(map(str, reg['case']))} {reg['metric']}: "
+                  f"{reg['baseline']:.4g} -> {reg['current']:.4g} ({reg['change']:+.1%})",
+                  file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -202,6 +202,51 @@ def give_zipf_pareto(arr, alpha, xm=1.0):
     return _rescale_to_arr_range(arr, theo)
 
 
+# ------- transforms (no closed-form quantiles) ------- #
+# For these keys G itself is the model: keys spread evenly in G-space,
+# so the predicted array is G^-1 of an even grid between G(min) and G(max).
+
+def give_zipf_log(arr):
+    """
+    Keys evenly spaced in log space (G = log(max(x, 1))),
+    rescaled to [min(arr), max(arr)].
+    """
+    lo = np.log(max(float(np.min(arr)), 1.0))
+    hi = np.log(max(float(np.max(arr)), 1.0))
+    theo = np.exp(lo + _pk_from_arr(arr) * (hi - lo))
+    return _rescale_to_arr_range(arr, theo)
+
+
+def give_boxcox(arr, lmbd):
+    """
+    Keys evenly spaced after the Box-Cox transform (x^lmbd - 1) / lmbd
+    (log for lmbd = 0), rescaled to [min(arr), max(arr)].
+    """
+    lmbd = float(lmbd)
+    x = np.maximum(np.array([np.min(arr), np.max(arr)], dtype=float), 1e-300)
+    if abs(lmbd) < 1e-12:
+        u = np.log(x)
+        theo = np.exp(u[0] + _pk_from_arr(arr) * (u[1] - u[0]))
+    else:
+        u = (x ** lmbd - 1.0) / lmbd
+        grid = u[0] + _pk_from_arr(arr) * (u[1] - u[0])
+        theo = np.maximum(1.0 + lmbd * grid, 0.0) ** (1.0 / lmbd)
+    return _rescale_to_arr_range(arr, theo)
+
+
+def give_ecdf(arr, n_knots):
+    """
+    Piecewise-linear empirical quantiles through n_knots keys
+    sampled from arr (the inverse of G_ecdf).
+    """
+    arr = np.asarray(arr, dtype=float)
+    N = arr.size
+    if N <= 0:
+        return np.array([], dtype=float)
+    idx = np.unique(np.linspace(0, N - 1, max(2, min(int(n_knots), N))).astype(np.intp))
+    return np.interp(np.arange(N), idx, arr[idx])
+
+
 # plt.plot(ind, arr)
 
 
@@ -214,7 +259,10 @@ dists_funcs = {
     "weibull": give_weibull,
     "logistic": give_logistic,
     "zipf": give_zipf,
-    "zipfpareto": give_zipf_pareto
+    "zipfpareto": give_zipf_pareto,
+    "zipfLog": give_zipf_log,
+    "boxcox": give_boxcox,
+    "ecdf": give_ecdf
 }
 dist_params = {
     "uniform": ["a", "b"],
@@ -225,7 +273,10 @@ dist_params = {
     "weibull": ["k_shape", "lmbd"],
     "logistic": ["s", "mu"],
     "zipf": ["s", "k_max"],
-    "zipfpareto": ["alpha", "xm"]
+    "zipfpareto": ["alpha", "xm"],
+    "zipfLog": [],
+    "boxcox": ["lmbd"],
+    "ecdf": ["n_knots"]
 }
 
 
@@ -240,8 +291,9 @@ def call_distribution(arr, dist_tuple):
     fn = dists_funcs[name]  # pick the function
     param_names = dist_params[name]  # list of parameter names
 
-    # create keyword arguments dictionary
-    kwargs = {param_names[i]: values[i] for i in range(len(values))}
+    # create keyword arguments dictionary (keys may carry a placeholder
+    # value the handler doesn't take, e.g. ("zipfLog", 0))
+    kwargs = {param_names[i]: values[i] for i in range(min(len(values), len(param_names)))}
 
     # call the function
     return fn(arr, **kwargs)
@@ -270,7 +322,7 @@ best_name, best_score = lkaps(arr)
 print("Best fit:", best_name)
 
 # Creating a graph of the distribution predicted by L-KAPs
-dists = distributionList()
+dists = distributionList(arr)
 gen = dists[best_name]
 arr1 = call_distribution(arr, best_name)
 
@@ -3,7 +3,24 @@ kaps: K-Array Predictive Search implementations.
 
 Exports:
 - dd_kaps  → main Different-Distribution KAPS
+- dd_kaps_batch → DD-KAPS over a whole array of targets at once
+- KapsIndex → reusable DD-KAPS index with G(arr) precomputed
+- LearnedIndex → two-stage (RMI-style) learned index, KAPS for the last mile
+- save_index / open_index → memory-mapped on-disk index with a model sidecar
+- cached_lkaps / FitCache → L-KAPS fits cached on disk by array fingerprint
+- MutableKapsIndex → updatable index (delta buffer + tombstones, background merge)
+- DriftMonitor → rolling search-depth monitor that triggers L-KAPS refits
+- kaps_lower_bound / kaps_upper_bound / kaps_range → KAPS range queries
+- searchsorted → drop-in numpy.searchsorted replacement backed by KAPS
+- finger_search → lookups for ascending target streams, starting from the last answer
+- kaps_intersect / kaps_join → intersection and equi-join of two sorted arrays
 - lkaps    → L-KAPS (learns distribution)
+- lkaps_halving → L-KAPS with successive-halving candidate pruning
+- lkaps_fit → closed-form fit-and-rank model selection (milliseconds)
+- lkaps_optimize → L-KAPS with continuous per-family parameter search
+- autotune → picks (G, k, divisor) by measured lookup latency
+- SearchStats → opt-in probe / G-call / fallback / latency counters with percentiles
+- TraceRecorder / trace_queries / summarize_traces → per-level DD-KAPS traces
 - base_kaps → simplified 'teaching'/baseline KAPS
 
 Usage:
@@ -12,8 +29,23 @@ Usage:
 """
 
 from .dd_kaps import kaps as dd_kaps
+from .batch_kaps import dd_kaps_batch
+from .kaps_index import KapsIndex
+from .learned_index import LearnedIndex
+from .disk_index import save_index, open_index
+from .fit_cache import FitCache, cached_lkaps
+from .mutable_index import MutableKapsIndex
+from .drift import DriftMonitor
+from .range_scan import kaps_lower_bound, kaps_upper_bound, kaps_range
+from .searchsorted import searchsorted
+from .finger_search import finger_search
+from .join import kaps_intersect, kaps_join
 from .l_kaps import lkaps as lkaps
+from .l_kaps import lkaps_halving, lkaps_fit, lkaps_optimize
 from .base_kaps import kaps as base_kaps
+from .autotune import autotune
+from .stats import SearchStats
+from .tracing import TraceRecorder, trace_queries, summarize_traces
 from .lkaps_to_gchoice import make_G_from_lkaps as lkaps_to_G
 
 from . import generators     # for data generation
@@ -21,7 +53,31 @@ from . import baselines      # for binary + interpolation search
 
 __all__ = [
     "dd_kaps",
+    "dd_kaps_batch",
+    "KapsIndex",
+    "LearnedIndex",
+    "save_index",
+    "open_index",
+    "FitCache",
+    "cached_lkaps",
+    "MutableKapsIndex",
+    "DriftMonitor",
+    "kaps_lower_bound",
+    "kaps_upper_bound",
+    "kaps_range",
+    "searchsorted",
+    "finger_search",
+    "kaps_intersect",
+    "kaps_join",
     "lkaps",
+    "lkaps_halving",
+    "lkaps_fit",
+    "lkaps_optimize",
+    "autotune",
+    "SearchStats",
+    "TraceRecorder",
+    "trace_queries",
+    "summarize_traces",
     "base_kaps",
     "generators",
     "baselines",
@@ -0,0 +1,163 @@
+## Wall-clock autotuner: times DD-KAPS lookups for every candidate
+## (G, k, divisor) on a sample of real queries and keeps the fastest.
+## lkaps minimises probe count, but a G_normal level costs an erf while
+## a G_uniform level is nearly free, so the lowest depth is not always
+## the lowest latency.
+
+import gc
+import time
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps
+from .kaps_index import KapsIndex
+from .l_kaps import rank_distributions
+from .lkaps_to_gchoice import make_G_from_lkaps
+
+K_CHOICES = (4, 8, 16, 20, 32, 64)
+DIVISOR_CHOICES = (2, 4)
+CUTOFF_CHOICES = (1, 4, 8, 16, 32, 64, 128)
+SCAN_CHOICES = ("linear", "bisect", "searchsorted")
+
+# (container type, dtype, G_arr given) -> (cutoff, scan), filled by cutoff_for
+_cutoff_cache = {}
+
+
+def candidate_keys(arr, top=3):
+    """Uniform plus the `top` best closed-form fits from rank_distributions."""
+    keys = [("uniform", 0)]
+    for _, key in rank_distributions(arr):
+        if len(keys) > top:
+            break
+        if key[0] != "uniform":
+            keys.append(key)
+    return keys
+
+
+def autotune(arr, keys=None, k_values=K_CHOICES, divisors=DIVISOR_CHOICES,
+             n_queries=512, repeats=5, cached=False, seed=0):
+    """
+    Benchmarks every (G, k, divisor) combination and returns the fastest.
+
+    keys      : L-KAPS keys to try (default: candidate_keys(arr))
+    n_queries : keys sampled from arr to time
+    repeats   : timing passes per configuration; the fastest pass counts
+    cached    : time KapsIndex lookups (G(arr) prebuilt) instead of plain
+                dd_kaps, which changes how much an expensive G costs
+
+    Returns (best, table). Each row of table is a dict with "key", "G",
+    "k", "divisor", "ns_per_lookup" and "mean_depth"; table is sorted
+    fastest first and best is table[0].
+    """
+    arr = np.asarray(arr)
+    n = arr.size
+    if n == 0:
+        raise ValueError("arr must not be empty")
+    if keys is None:
+        keys = candidate_keys(arr)
+
+    rng = np.random.default_rng(seed)
+    queries = arr[rng.integers(0, n, n_queries)].tolist()
+
+    table = []
+    for key in keys:
+        G = make_G_from_lkaps(arr, key)
+        for k in k_values:
+            for divisor in divisors:
+                if cached:
+                    search = KapsIndex(arr, G, k, divisor).search
+                else:
+                    search = lambda t, k=k, divisor=divisor: dd_kaps(0, n - 1, arr, t, k, divisor, G)
+                try:
+                    seconds, depth = _time_lookups(search, queries, repeats)
+                except (ArithmeticError, ValueError):
+                    continue
+                table.append({
+                    "key": key,
+                    "G": G,
+                    "k": k,
+                    "divisor": divisor,
+                    "ns_per_lookup": 1e9 * seconds / len(queries),
+                    "mean_depth": depth / len(queries),
+                })
+
+    if not table:
+        raise ValueError("no candidate configuration could be timed")
+    table.sort(key=lambda row: row["ns_per_lookup"])
+    return table[0], table
+
+
+def tune_cutoff(arr, G, k=20, divisor=2, cutoffs=CUTOFF_CHOICES, scans=SCAN_CHOICES,
+                G_arr=None, n_queries=512, repeats=5, seed=0):
+    """
+    Times dd_kaps with hybrid termination for every (cutoff, scan) pair.
+
+    The best cutoff depends on what a probe costs versus a G level, which
+    is mostly a property of the container and dtype (a list of ints, an
+    ndarray of float64, ...), so one tuning per dtype is usually enough;
+    see cutoff_for.
+
+    Returns (best, table) like autotune; rows have "cutoff", "scan",
+    "ns_per_lookup" and "mean_depth".
+    """
+    n = len(arr)
+    if n == 0:
+        raise ValueError("arr must not be empty")
+    rng = np.random.default_rng(seed)
+    queries = [arr[i] for i in rng.integers(0, n, n_queries).tolist()]
+    if isinstance(arr, np.ndarray):
+        queries = [q.item() for q in queries]
+
+    table = []
+    for cutoff in cutoffs:
+        # scan only matters once there is more than one element to scan
+        for scan in (scans if cutoff > 1 else scans[:1]):
+            if scan == "searchsorted" and not isinstance(arr, np.ndarray):
+                continue
+            search = lambda t, cutoff=cutoff, scan=scan: dd_kaps(
+                0, n - 1, arr, t, k, divisor, G, G_arr, cutoff=cutoff, scan=scan)
+            seconds, depth = _time_lookups(search, queries, repeats)
+            table.append({
+                "cutoff": cutoff,
+                "scan": scan,
+                "ns_per_lookup": 1e9 * seconds / len(queries),
+                "mean_depth": depth / len(queries),
+            })
+
+    table.sort(key=lambda row: row["ns_per_lookup"])
+    return table[0], table
+
+
+def cutoff_for(arr, G, k=20, divisor=2, G_arr=None):
+    """
+    (cutoff, scan) for arr's container type and dtype (and whether
+    G_arr is prebuilt), tuned with tune_cutoff on the first array of
+    that kind and reused afterwards.
+    """
+    if isinstance(arr, np.ndarray):
+        dtype = arr.dtype.str
+    else:
+        dtype = type(arr[0]).__name__ if len(arr) else None
+    kind = (type(arr).__name__, dtype, G_arr is not None)
+    if kind not in _cutoff_cache:
+        best, _ = tune_cutoff(arr, G, k, divisor, G_arr=G_arr)
+        _cutoff_cache[kind] = (best["cutoff"], best["scan"])
+    return _cutoff_cache[kind]
+
+
+def _time_lookups(search, queries, repeats):
+    # Best of `repeats` passes with the collector off, like timeit
+    depth = sum(search(t)[1] for t in queries)   # warm-up, and the depth total
+    best = float("inf")
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for t in queries:
+                search(t)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return best, depth
@@ -1,8 +1,31 @@
 """
 Baseline search algorithms for comparison with KAPS.
+
+Every search returns (index, depth); the *_batch variants take an
+array of targets and return (index, depth) arrays, entry for entry
+equal to the scalar results. timed() adds wall-clock nanoseconds.
 """
 
 from .binary_search import binary_search
 from .interpolation_search import interpolation_search
+from .interpolation_sequential_search import interpolation_sequential_search
+from .exponential_search import exponential_search
+from .batch import (
+    binary_search_batch,
+    interpolation_search_batch,
+    interpolation_sequential_search_batch,
+    exponential_search_batch,
+)
+from .timing import timed
 
-__all__ = ["binary_search", "interpolation_search"]
+__all__ = [
+    "binary_search",
+    "interpolation_search",
+    "interpolation_sequential_search",
+    "exponential_search",
+    "binary_search_batch",
+    "interpolation_search_batch",
+    "interpolation_sequential_search_batch",
+    "exponential_search_batch",
+    "timed",
+]
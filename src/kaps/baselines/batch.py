@@ -0,0 +1,176 @@
+# Batched NumPy versions of the baselines: every target advances one
+# probe per pass, in lockstep, and each entry of the result matches
+# what the scalar search returns for that target, depth included.
+
+import numpy as np
+
+
+def _setup(arr, targets, lo, hi):
+    arr = np.asarray(arr)
+    targets = np.asarray(targets)
+    shape = targets.shape
+    t = targets.ravel()
+    n_t = t.size
+    lo = np.zeros(n_t, dtype=np.intp) if lo is None else np.broadcast_to(lo, shape).ravel().astype(np.intp)
+    hi = np.full(n_t, arr.size - 1, dtype=np.intp) if hi is None else np.broadcast_to(hi, shape).ravel().astype(np.intp)
+    index = np.full(n_t, -1, dtype=np.intp)
+    depth = np.zeros(n_t, dtype=np.intp)
+    return arr, t, lo, hi, index, depth, shape
+
+
+def _at(arr, i):
+    # arr[i] for indices that may have stepped one past either end
+    return arr[np.clip(i, 0, arr.size - 1)]
+
+
+def _interp(arr, t, lo, hi):
+    # lo + int((hi - lo) * ((x - arr[lo]) / (arr[hi] - arr[lo]))), like the scalar code
+    a_lo, a_hi = arr[lo], arr[hi]
+    flat = a_hi == a_lo
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = (t - a_lo) / np.where(flat, 1, a_hi - a_lo)
+    return lo + np.where(flat, 0, np.floor((hi - lo) * frac)).astype(np.intp)
+
+
+# ---------- Binary search ----------
+def _binary_lockstep(arr, t, lo, hi, index, depth, ids):
+    # Scalar binary_search for targets t[k] on windows [lo[k], hi[k]],
+    # writing into index / depth at positions ids
+    while ids.size:
+        empty = lo > hi
+        depth[ids[empty]] += 1          # the emptied range counts as one level
+        keep = ~empty
+        ids, t, lo, hi = ids[keep], t[keep], lo[keep], hi[keep]
+        if not ids.size:
+            break
+
+        depth[ids] += 1
+        mid = (lo + hi) // 2
+        v = arr[mid]
+
+        found = v == t
+        index[ids[found]] = mid[found]
+
+        lo = np.where(v < t, mid + 1, lo)
+        hi = np.where(v > t, mid - 1, hi)
+
+        keep = ~found
+        ids, t, lo, hi = ids[keep], t[keep], lo[keep], hi[keep]
+
+
+def binary_search_batch(arr, targets, lo=None, hi=None):
+    """Batched binary_search; returns (index, depth) arrays shaped like targets."""
+    arr, t, lo, hi, index, depth, shape = _setup(arr, targets, lo, hi)
+    if arr.size and t.size:
+        _binary_lockstep(arr, t, lo, hi, index, depth, np.arange(t.size))
+    else:
+        depth[:] = 1
+    return index.reshape(shape), depth.reshape(shape)
+
+
+# ---------- Interpolation search ----------
+def interpolation_search_batch(arr, targets, lo=None, hi=None, max_depth=998):
+    """Batched interpolation_search; returns (index, depth) arrays shaped like targets."""
+    arr, t, lo, hi, index, depth, shape = _setup(arr, targets, lo, hi)
+    if not arr.size:
+        depth[:] = 1
+        return index.reshape(shape), depth.reshape(shape)
+
+    ids = np.arange(t.size)
+    level = 0
+    while ids.size:
+        level += 1
+        depth[ids] = level
+
+        # Safety stop, as in the scalar version: binary search finishes the window
+        if max_depth is not None and level > max_depth:
+            depth[ids] = level - 1
+            _binary_lockstep(arr, t, lo, hi, index, depth, ids)
+            break
+
+        # Valid bounds
+        ok = (lo <= hi) & (_at(arr, lo) <= t) & (t <= _at(arr, hi))
+        ids, t, lo, hi = ids[ok], t[ok], lo[ok], hi[ok]
+        if not ids.size:
+            break
+
+        # Constant window: one candidate left
+        const = arr[hi] == arr[lo]
+        hit = const & (arr[lo] == t)
+        index[ids[hit]] = lo[hit]
+        keep = ~const
+        ids, t, lo, hi = ids[keep], t[keep], lo[keep], hi[keep]
+
+        pos = _interp(arr, t, lo, hi)
+        v = arr[pos]
+        found = v == t
+        index[ids[found]] = pos[found]
+
+        lo = np.where(v < t, pos + 1, lo)
+        hi = np.where(v > t, pos - 1, hi)
+        keep = ~found
+        ids, t, lo, hi = ids[keep], t[keep], lo[keep], hi[keep]
+
+    return index.reshape(shape), depth.reshape(shape)
+
+
+# ---------- Interpolation-sequential search ----------
+def interpolation_sequential_search_batch(arr, targets, lo=None, hi=None):
+    """Batched interpolation_sequential_search; returns (index, depth) arrays shaped like targets."""
+    arr, t, lo, hi, index, depth, shape = _setup(arr, targets, lo, hi)
+    depth[:] = 1
+    if not arr.size:
+        return index.reshape(shape), depth.reshape(shape)
+
+    ids = np.arange(t.size)
+    ok = (lo <= hi) & (_at(arr, lo) <= t) & (t <= _at(arr, hi))
+    ids, t, lo, hi = ids[ok], t[ok], lo[ok], hi[ok]
+
+    pos = _interp(arr, t, lo, hi)
+
+    # Walk right, then left, one step per pass for every target still moving
+    for step in (1, -1):
+        moving = np.flatnonzero(arr[pos] < t if step == 1 else arr[pos] > t)
+        while moving.size:
+            pos[moving] += step
+            depth[ids[moving]] += 1
+            p, tm = pos[moving], t[moving]
+            moving = moving[arr[p] < tm if step == 1 else arr[p] > tm]
+
+    found = arr[pos] == t
+    index[ids[found]] = pos[found]
+    return index.reshape(shape), depth.reshape(shape)
+
+
+# ---------- Exponential search ----------
+def exponential_search_batch(arr, targets, lo=None, hi=None):
+    """Batched exponential_search; returns (index, depth) arrays shaped like targets."""
+    arr, t, lo, hi, index, depth, shape = _setup(arr, targets, lo, hi)
+    depth[:] = 1
+    if not arr.size:
+        return index.reshape(shape), depth.reshape(shape)
+
+    ids = np.arange(t.size)
+    ok = lo <= hi
+    ids, t, lo, hi = ids[ok], t[ok], lo[ok], hi[ok]
+
+    # Found, or x lies before the whole window
+    first = arr[lo]
+    done = first >= t
+    hit = done & (first == t)
+    index[ids[hit]] = lo[hit]
+    keep = ~done
+    ids, t, lo, hi = ids[keep], t[keep], lo[keep], hi[keep]
+
+    # Gallop: probe lo+1, lo+2, lo+4, ... until a key >= x
+    step = np.ones(ids.size, dtype=np.intp)
+    moving = np.flatnonzero(lo + step <= hi)
+    while moving.size:
+        depth[ids[moving]] += 1
+        past = arr[lo[moving] + step[moving]] >= t[moving]
+        moving = moving[~past]
+        step[moving] *= 2
+        moving = moving[lo[moving] + step[moving] <= hi[moving]]
+
+    _binary_lockstep(arr, t, lo + step // 2 + 1, np.minimum(lo + step, hi), index, depth, ids)
+    return index.reshape(shape), depth.reshape(shape)
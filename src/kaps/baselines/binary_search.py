@@ -1,36 +1,27 @@
 # Python3 program to implement
-# binary search with recursion
-
-depth = 0
+# binary search with a loop
 
 def binary_search(arr, lo, hi, x):
-    global depth
-    depth += 1
 
-    # Prevent excessive recursion (max depth safety)
-    if depth > 998:              # adjust if needed
-        return -1, depth
+    depth = 0
 
     # Valid range check
-    if lo <= hi:
+    while lo <= hi:
+        depth += 1
 
         mid = (lo + hi) // 2
 
         # Found
         if arr[mid] == x:
-            d = depth
-            depth = 0
-            return mid, d
+            return mid, depth
 
         # If x is larger → right half
         if arr[mid] < x:
-            return binary_search(arr, mid + 1, hi, x)
+            lo = mid + 1
 
         # If x is smaller → left half
-        if arr[mid] > x:
-            return binary_search(arr, lo, mid - 1, x)
-
-    d = depth
-    depth = 0
-    return -1, d
+        else:
+            hi = mid - 1
 
+    # The emptied range still counts as one (failed) level
+    return -1, depth + 1
@@ -0,0 +1,28 @@
+# Python3 program to implement
+# exponential (galloping) search with a loop
+
+from .binary_search import binary_search
+
+
+def exponential_search(arr, lo, hi, x):
+
+    depth = 1
+
+    if lo > hi:
+        return -1, depth
+
+    # Found, or x lies before the whole window
+    if arr[lo] >= x:
+        return (lo if arr[lo] == x else -1), depth
+
+    # Gallop: probe lo+1, lo+2, lo+4, ... until a key >= x
+    step = 1
+    while lo + step <= hi:
+        depth += 1
+        if arr[lo + step] >= x:
+            break
+        step *= 2
+
+    # arr[lo + step//2] < x, so x can only be in (lo + step//2, lo + step]
+    idx, d = binary_search(arr, lo + step // 2 + 1, min(lo + step, hi), x)
+    return idx, depth + d
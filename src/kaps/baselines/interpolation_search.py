@@ -1,47 +1,45 @@
 # Python3 program to implement
-# interpolation search with recursion
+# interpolation search with a loop
 
-depth = 0
+from .binary_search import binary_search
 
-def interpolation_search(arr, lo, hi, x):
 
-    global depth
-    depth += 1
+def interpolation_search(arr, lo, hi, x, max_depth=998):
 
-    # Safety stop — prevents recursion overflow
-    if depth > 998:
-        d = depth
-        depth = 0
-        return -1, d
+    depth = 0
+
+    while True:
+        depth += 1
+
+        # Safety stop — interpolation can degrade to a linear walk, so
+        # after max_depth levels finish the window with binary search;
+        # pass max_depth=None to interpolate until the window is exhausted
+        if max_depth is not None and depth > max_depth:
+            idx, d = binary_search(arr, lo, hi, x)
+            return idx, depth - 1 + d
 
-    # Valid bounds
-    if lo <= hi and arr[lo] <= x <= arr[hi]:
+        # Valid bounds
+        if not (lo <= hi and arr[lo] <= x <= arr[hi]):
+            return -1, depth
 
-        # Prevent divide-by-zero infinite recursion
+        # Prevent divide-by-zero on a constant window
         if arr[hi] == arr[lo]:
             if arr[lo] == x:
                 return lo, depth
-            d = depth
-            depth = 0
-            return -1, d
+            return -1, depth
 
-        # Probing the position
-        pos = int(lo + ((hi - lo) // (arr[hi] - arr[lo])) * (x - arr[lo]))
+        # Probing the position: fraction of the value range first, so
+        # float keys interpolate properly and int keys can't overflow
+        pos = lo + int((hi - lo) * ((x - arr[lo]) / (arr[hi] - arr[lo])))
 
         # Found
         if arr[pos] == x:
-            d = depth
-            depth = 0
-            return pos, d
+            return pos, depth
 
         # Right side
         if arr[pos] < x:
-            return interpolation_search(arr, pos + 1, hi, x)
+            lo = pos + 1
 
         # Left side
-        if arr[pos] > x:
-            return interpolation_search(arr, lo, pos - 1, x)
-
-    d = depth
-    depth = 0
-    return -1, d
\ No newline at end of file
+        else:
+            hi = pos - 1
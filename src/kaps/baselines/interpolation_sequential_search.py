@@ -0,0 +1,28 @@
+# Python3 program to implement
+# interpolation-sequential search with a loop
+
+def interpolation_sequential_search(arr, lo, hi, x):
+
+    # One interpolation probe, then a sequential walk from it;
+    # depth counts every probe
+    depth = 1
+
+    # Valid bounds
+    if not (lo <= hi and arr[lo] <= x <= arr[hi]):
+        return -1, depth
+
+    # Probing the position (a constant window has only one candidate)
+    if arr[hi] == arr[lo]:
+        pos = lo
+    else:
+        pos = lo + int((hi - lo) * ((x - arr[lo]) / (arr[hi] - arr[lo])))
+
+    # Walk right, then left; arr[lo] <= x <= arr[hi] keeps both in bounds
+    while arr[pos] < x:
+        pos += 1
+        depth += 1
+    while arr[pos] > x:
+        pos -= 1
+        depth += 1
+
+    return (pos if arr[pos] == x else -1), depth
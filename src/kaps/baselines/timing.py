@@ -0,0 +1,14 @@
+# Wall-clock timing for any search with the (index, depth) contract,
+# scalar or batched.
+
+import time
+
+
+def timed(search, *args, **kwargs):
+    """
+    Calls search(*args, **kwargs) and returns (index, depth, ns):
+    its usual result plus the elapsed wall-clock time in nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    index, depth = search(*args, **kwargs)
+    return index, depth, time.perf_counter_ns() - start
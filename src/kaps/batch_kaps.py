@@ -0,0 +1,146 @@
+## Batched DD-KAPS: runs many targets through the k-ary bucket
+## refinement in lockstep, one NumPy pass per level instead of one
+## Python call per level per target.
+
+import numpy as np
+
+from .dd_kaps import apply_G
+
+
+def dd_kaps_batch(arr, targets, k, divisor, G, G_arr=None, lo=None, hi=None,
+                  cutoff=1, scan="linear", guard=None):
+    """
+    Searches every value of `targets` in the sorted array `arr`.
+
+    Mirrors dd_kaps.kaps level by level (same fast rejects, k shrinking,
+    bucket clamping, widening branches and terminal scan), so each entry
+    of the result matches what the scalar search returns for that target.
+
+    G_arr, if given, is G(arr) precomputed (see KapsIndex), so G is only
+    evaluated on the targets.
+
+    lo, hi optionally give each target its own starting window
+    (inclusive, lo <= hi, like the scalar call); default is the whole array.
+
+    cutoff and guard behave as in dd_kaps (small-window scan, and a
+    bisection step after a poor widening step). scan is accepted for
+    parity with dd_kaps: every scan method returns the same index, and
+    the batch always finishes small windows with its own vectorized scan.
+
+    Returns (index, depth) as two int arrays shaped like `targets`;
+    index is -1 where the target is absent.
+    """
+    arr = np.asarray(arr)
+    targets = np.asarray(targets)
+    shape = targets.shape
+    flat = targets.ravel()
+
+    if scan not in ("linear", "bisect", "searchsorted"):
+        raise ValueError(f"unknown scan method: {scan!r}")
+
+    n_t = flat.size
+    index = np.full(n_t, -1, dtype=np.intp)
+    depth = np.zeros(n_t, dtype=np.intp)
+    if n_t == 0 or arr.size == 0:
+        return index.reshape(shape), depth.reshape(shape)
+
+    # Per-target state, compacted to the still-active targets each level
+    ids = np.arange(n_t)
+    t = flat
+    Gt = apply_G(G, flat)
+    lo = np.zeros(n_t, dtype=np.intp) if lo is None else np.broadcast_to(lo, shape).ravel().astype(np.intp)
+    hi = np.full(n_t, arr.size - 1, dtype=np.intp) if hi is None else np.broadcast_to(hi, shape).ravel().astype(np.intp)
+    kk = np.full(n_t, k, dtype=np.intp)
+    div = max(1, divisor)
+
+    while ids.size:
+        depth[ids] += 1
+
+        a_lo = arr[lo]
+        a_hi = arr[hi]
+
+        # Fast rejects: target outside current window's value range
+        out = (t < a_lo) | (t > a_hi)
+
+        # Base case: interval collapsed to one element, or under the cutoff
+        small = ~out & (hi - lo < cutoff)
+        if small.any():
+            _scan(arr, t[small], lo[small], hi[small], ids[small], index)
+
+        keep = ~(out | small)
+        ids, t, Gt, lo, hi, kk = ids[keep], t[keep], Gt[keep], lo[keep], hi[keep], kk[keep]
+        a_lo, a_hi = a_lo[keep], a_hi[keep]
+        if not ids.size:
+            break
+
+        # Avoid over-partitioning; keep k >= 1
+        kk = np.where(hi - lo <= kk, np.maximum(1, kk // div), kk)
+
+        # Interpolation step in transformed space
+        if G_arr is None:
+            Ga = apply_G(G, a_lo)
+            denom = apply_G(G, a_hi) - Ga
+        else:
+            Ga = G_arr[lo]
+            denom = G_arr[hi] - Ga
+        flat_G = denom == 0
+        pos = np.where(flat_G, (kk - 1) / 2.0, kk * (Gt - Ga) / np.where(flat_G, 1.0, denom))
+
+        # Integer bucket index, clamped to [0, k-1]
+        b = np.clip(np.floor(pos), 0, kk - 1).astype(np.intp)
+
+        # Map bucket -> [subLo, subHi] (inclusive bounds)
+        span = hi - lo
+        subLo = lo + (span * b) // kk
+        subHi = lo + (span * (b + 1)) // kk
+
+        s_lo = arr[subLo]
+        s_hi = arr[subHi]
+
+        # Adjust sub-interval if target falls outside bucket boundaries
+        left = t < s_lo
+        right = ~left & (t > s_hi)
+        inside = ~(left | right)
+
+        # Direct hit checks for bucket edges
+        hit_lo = inside & (s_lo == t)
+        hit_hi = inside & ~hit_lo & (s_hi == t)
+        index[ids[hit_lo]] = subLo[hit_lo]
+        index[ids[hit_hi]] = subHi[hit_hi]
+
+        new_lo = np.where(left, lo, np.where(right, subHi, subLo))
+        new_hi = np.where(left, subLo, np.where(right, hi, subHi))
+
+        # Guarded mode: a widening step that kept too much is followed by a bisection
+        if guard is not None:
+            g = (left | right) & (new_hi - new_lo > guard * span)
+            if g.any():
+                depth[ids[g]] += 1
+                mid = (new_lo[g] + new_hi[g]) // 2
+                below = t[g] <= arr[mid]
+                new_lo[g] = np.where(below, new_lo[g], mid + 1)
+                new_hi[g] = np.where(below, mid, new_hi[g])
+
+        live = ~(hit_lo | hit_hi)
+        cont = live & (new_hi - new_lo > 1) & (kk > 1)
+        term = live & ~cont
+
+        # Terminal step: scan the few remaining candidates
+        if term.any():
+            _scan(arr, t[term], new_lo[term], new_hi[term], ids[term], index)
+
+        ids, t, Gt, kk = ids[cont], t[cont], Gt[cont], kk[cont]
+        lo, hi = new_lo[cont], new_hi[cont]
+
+    return index.reshape(shape), depth.reshape(shape)
+
+
+def _scan(arr, t, lo, hi, ids, index):
+    # First match in each [lo, hi] window, one offset at a time
+    pending = np.ones(t.size, dtype=bool)
+    width = hi - lo
+    for off in range(int(width.max()) + 1):
+        i = np.minimum(lo + off, hi)
+        hit = pending & (off <= width) & (arr[i] == t)
+        index[ids[hit]] = i[hit]
+        pending &= ~hit
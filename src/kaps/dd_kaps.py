@@ -1,74 +1,103 @@
 ## NOTE: This is a test implementation of k-ary predictive search,
 ## still experimental and may need further adjustments.
 
-# Tracks recursion depth for debugging / tracing
-depth = 0
-
-def kaps(lo, hi, arr, target, k, divisor, G_choice):
-
-    global depth
-    depth += 1
-
-    # Fast rejects: target outside current window's value range
-    if target < arr[lo] or target > arr[hi]:
-        d = depth
-        depth = 0
-        return -1, d
-
-    # Base case: interval collapsed to one element.
-    if lo == hi:
-        d = depth
-        depth = 0
-        return lo, depth if arr[lo] == target else -1, d
-
-    # Avoid over-partitioning; keep k >= 1  (FIX #2)
-    if hi - lo <= k:
-        k = max(1, k // max(1, divisor))
-
-    # Interpolation step in transformed space
-    pos = interp_pos(arr, lo, hi, target, k, G_choice)
-
-    # Compute integer bucket index and CLAMP to [0, k-1]  (FIX #1)
-    import math
-    b = int(math.floor(pos))
-    if b < 0: b = 0
-    elif b >= k: b = k - 1
-
-    # Map bucket -> [subLo, subHi] (inclusive bounds)
-    span = hi - lo
-    subLo = lo + (span * b) // k
-    subHi = lo + (span * (b + 1)) // k
-
-    # Adjust sub-interval if target falls outside bucket boundaries.
-    if target < arr[subLo]:
-        subLo, subHi = lo, subLo
-    elif target > arr[subHi]:
-        subHi, subLo = hi, subHi
-    else:
-        # Direct hit checks for bucket edges.
-        if arr[subLo] == target:
-            d = depth
-            depth = 0
-            return subLo, d
-        elif arr[subHi] == target:
-            d = depth
-            depth = 0
-            return subHi, d
-        # otherwise keep current [subLo, subHi]
-
-    # Recurse if interval still >1 and k allows further partitioning.
-    if subHi - subLo > 1 and k > 1:
-        return kaps(subLo, subHi, arr, target, k, divisor, G_choice)  # (FIX #3)
-    else:
+def kaps(lo, hi, arr, target, k, divisor, G_choice, G_arr=None, stats=None, tracer=None,
+         cutoff=1, scan="linear", guard=None):
+
+    # guard, when given (e.g. 0.5), bounds the worst case: a widening step
+    # that keeps more than guard * (hi - lo) of the window is followed by a
+    # bisection step, so every two levels at least halve the window and a
+    # bad G costs at most ~2*log2(n) levels instead of a linear walk
+
+    # Windows with hi - lo < cutoff are finished by scan_window instead of
+    # more partitioning levels (cutoff=1: only a single element is left);
+    # see autotune.tune_cutoff for picking cutoff and scan per dtype
+
+    # tracer, when given, is called once per partitioning level as
+    # tracer(level, lo, hi, pos, bucket, subLo, subHi, branch), with
+    # [subLo, subHi] the window kept and branch one of
+    # "bucket" (target inside the predicted bucket), "left" or "right"
+    # (target outside it; the window widened to that side), or
+    # "bisect" for a guard step (pos and bucket are None)
+
+    # Iterative, with no module-level state: safe to call from many threads
+    depth = 0
+
+    # With a prebuilt G_arr (= G(arr)), G only runs on the target, once
+    if G_arr is not None:
+        Gt = G_choice(target)
+
+    while True:
+        depth += 1
+
+        # Fast rejects: target outside current window's value range
+        if target < arr[lo] or target > arr[hi]:
+            return -1, depth
+
+        # Base case: interval collapsed to one element, or small enough
+        # that scanning it beats another level of G evaluations.
+        if hi - lo < cutoff:
+            if lo == hi:
+                return (lo if arr[lo] == target else -1), depth
+            if stats is not None: stats.on_scan()
+            return scan_window(arr, lo, hi, target, scan), depth
+
+        # Avoid over-partitioning; keep k >= 1  (FIX #2)
+        if hi - lo <= k:
+            k = max(1, k // max(1, divisor))
+
+        # Interpolation step in transformed space
+        if G_arr is None:
+            pos = interp_pos(arr, lo, hi, target, k, G_choice)
+        else:
+            pos = interp_pos_cached(G_arr, lo, hi, Gt, k)
+
+        # Compute integer bucket index and CLAMP to [0, k-1]  (FIX #1)
+        b = int(math.floor(pos))
+        if b < 0: b = 0
+        elif b >= k: b = k - 1
+
+        # Map bucket -> [subLo, subHi] (inclusive bounds)
+        span = hi - lo
+        subLo = lo + (span * b) // k
+        subHi = lo + (span * (b + 1)) // k
+
+        # Adjust sub-interval if target falls outside bucket boundaries.
+        # (stats, when given, only sees these widening branches and the scan)
+        if target < arr[subLo]:
+            subLo, subHi = lo, subLo
+            if stats is not None: stats.on_fallback()
+            if tracer is not None: tracer(depth, lo, hi, pos, b, subLo, subHi, "left")
+            if guard is not None and subHi - subLo > guard * span:
+                depth += 1
+                subLo, subHi = _bisect_step(arr, subLo, subHi, target, depth, tracer)
+        elif target > arr[subHi]:
+            subHi, subLo = hi, subHi
+            if stats is not None: stats.on_fallback()
+            if tracer is not None: tracer(depth, lo, hi, pos, b, subLo, subHi, "right")
+            if guard is not None and subHi - subLo > guard * span:
+                depth += 1
+                subLo, subHi = _bisect_step(arr, subLo, subHi, target, depth, tracer)
+        else:
+            if tracer is not None: tracer(depth, lo, hi, pos, b, subLo, subHi, "bucket")
+            # Direct hit checks for bucket edges.
+            if arr[subLo] == target:
+                return subLo, depth
+            elif arr[subHi] == target:
+                return subHi, depth
+            # otherwise keep current [subLo, subHi]
+
+        # Keep descending if interval still >1 and k allows further partitioning.
+        if subHi - subLo > 1 and k > 1:
+            lo, hi = subLo, subHi
+            continue
+
         # Terminal step: at most two candidates left (loop over <=2 elements)
+        if stats is not None: stats.on_scan()
         for i in range(subLo, subHi + 1):
             if arr[i] == target:
-                d = depth
-                depth = 0
-                return i, d
-        d = depth
-        depth = 0
-        return -1, d
+                return i, depth
+        return -1, depth
 
 
 
@@ -76,6 +105,9 @@ def kaps(lo, hi, arr, target, k, divisor, G_choice):
 
 
 import math
+from bisect import bisect_left, bisect_right
+
+import numpy as np
 
 # ---------- Core helper ----------
 def interp_pos(arr, lo, hi, target, k, G):
@@ -86,8 +118,122 @@ def interp_pos(arr, lo, hi, target, k, G):
     return k * (Gt - Ga) / denom
 
 
+def _bisect_step(arr, lo, hi, target, level, tracer=None):
+    # One binary-search probe for guarded kaps; returns the half kept
+    mid = (lo + hi) // 2
+    if target <= arr[mid]:
+        subLo, subHi = lo, mid
+    else:
+        subLo, subHi = mid + 1, hi
+    if tracer is not None:
+        tracer(level, lo, hi, None, None, subLo, subHi, "bisect")
+    return subLo, subHi
+
+
+def scan_window(arr, lo, hi, target, method="linear"):
+    """
+    Index of target in the sorted window arr[lo..hi] (inclusive), or -1.
+
+    "linear"       : element by element, stopping at the first key >= target
+    "bisect"       : bisect_left restricted to the window (any sequence)
+    "searchsorted" : np.searchsorted on the slice (ndarrays)
+    """
+    if method == "linear":
+        for i in range(lo, hi + 1):
+            v = arr[i]
+            if v >= target:
+                return i if v == target else -1
+        return -1
+    if method == "bisect":
+        i = bisect_left(arr, target, lo, hi + 1)
+    elif method == "searchsorted":
+        i = lo + int(np.searchsorted(arr[lo:hi + 1], target))
+    else:
+        raise ValueError(f"unknown scan method: {method!r}")
+    return i if i <= hi and arr[i] == target else -1
+
+
+def interp_pos_cached(G_arr, lo, hi, Gt, k):
+    # Same as interp_pos, reading G(arr[i]) from a prebuilt buffer
+    Ga = G_arr[lo]
+    denom = G_arr[hi] - Ga
+    if denom == 0:
+        return (k - 1) / 2.0
+    return k * (Gt - Ga) / denom
+
+
+def apply_G(G, x):
+    """
+    Evaluates G over a whole array at once: through G.vectorized when G
+    has one, else G itself if it takes arrays, else element by element.
+    """
+    x = np.asarray(x)
+    vec = getattr(G, "vectorized", None)
+    if vec is not None:
+        return np.asarray(vec(x.astype(np.float64)), dtype=np.float64).reshape(x.shape)
+    try:
+        out = G(x)
+        if np.shape(out) == x.shape:
+            return np.asarray(out, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    flat = x.ravel()
+    out = np.fromiter((G(v) for v in flat), dtype=np.float64, count=flat.size)
+    return out.reshape(x.shape)
+
+
+
+# ---------- Vectorized erf (no SciPy needed) ----------
+_ERF_SERIES_TERMS = 32   # |x| < 2: exp(-x^2) * sum of positive terms
+_ERFC_CF_TERMS = 40      # 2 <= |x| < 6: continued fraction for erfc
+_TWO_OVER_SQRT_PI = 2.0 / math.sqrt(math.pi)
+
+def erf(x):
+    """
+    Error function for scalars (math.erf) and ndarrays alike.
+    The array path agrees with math.erf to ~1e-15.
+    """
+    if not isinstance(x, (np.ndarray, list, tuple)):
+        return math.erf(x)
+
+    x = np.asarray(x, dtype=np.float64)
+    a = np.abs(x)
+    out = np.ones_like(a)          # erf(|x| >= 6) == 1 in double precision
+
+    small = a < 2.0
+    if small.any():
+        z = a[small]
+        z2 = 2.0 * z * z
+        term = z.copy()
+        total = z.copy()
+        for n in range(1, _ERF_SERIES_TERMS):
+            term *= z2 / (2 * n + 1)
+            total += term
+        out[small] = _TWO_OVER_SQRT_PI * np.exp(-z * z) * total
+
+    mid = ~small & (a < 6.0)
+    if mid.any():
+        z = a[mid]
+        f = z.copy()
+        for n in range(_ERFC_CF_TERMS, 0, -1):
+            f = z + (n / 2.0) / f
+        out[mid] = 1.0 - np.exp(-z * z) / (math.sqrt(math.pi) * f)
+
+    out[np.isnan(a)] = np.nan
+    return np.copysign(out, x)
+
+
+def _ufunc(scalar_G, array_G):
+    # G is the plain math-module function, so scalar lookups call it with
+    # no wrapper; the NumPy version rides along as G.vectorized for apply_G.
+    scalar_G.vectorized = array_G
+    return scalar_G
+
+
 
 # ---------- G(x) transforms by distribution ----------
+# Every G is a scalar function; G.vectorized (used by apply_G) transforms
+# a whole ndarray in one pass.
 
 # 1) Uniform(A,B): identity
 def G_uniform():
@@ -97,18 +243,27 @@ def G_uniform():
 def G_normal(mu, sigma):
     if sigma <= 0: raise ValueError("sigma must be > 0")
     rt2 = math.sqrt(2.0)
-    return lambda x: 0.5 * (1.0 + math.erf((x - mu) / (sigma * rt2)))
+    return _ufunc(
+        lambda x: 0.5 * (1.0 + math.erf((x - mu) / (sigma * rt2))),
+        lambda x: 0.5 * (1.0 + erf((x - mu) / (sigma * rt2))),
+    )
 
 # 3) Exponential(lambda): 1 - exp(-lambda x), x >= 0
 def G_exponential(lmbda):
     if lmbda <= 0: raise ValueError("lambda must be > 0")
-    return lambda x: 1.0 - math.exp(-lmbda * max(x, 0.0))
+    return _ufunc(
+        lambda x: 1.0 - math.exp(-lmbda * max(x, 0.0)),
+        lambda x: 1.0 - np.exp(-lmbda * np.maximum(x, 0.0)),
+    )
 
 # 4) Lognormal(mu, sigma): Phi((ln x - mu)/sigma), x > 0
 def G_lognormal(mu, sigma):
     if sigma <= 0: raise ValueError("sigma must be > 0")
     rt2 = math.sqrt(2.0)
-    return lambda x: 0.5 * (1.0 + math.erf((math.log(max(x, 1e-300)) - mu) / (sigma * rt2)))
+    return _ufunc(
+        lambda x: 0.5 * (1.0 + math.erf((math.log(max(x, 1e-300)) - mu) / (sigma * rt2))),
+        lambda x: 0.5 * (1.0 + erf((np.log(np.maximum(x, 1e-300)) - mu) / (sigma * rt2))),
+    )
 
 # 5) Pareto(xm, alpha): 1 - (xm/x)^alpha, x >= xm > 0
 def G_pareto(xm, alpha):
@@ -116,17 +271,24 @@ def G_pareto(xm, alpha):
     def _G(x):
         if x < xm: return 0.0
         return 1.0 - (xm / x) ** alpha
-    return _G
+    # clamping x up to xm gives exactly 0 below the support
+    return _ufunc(_G, lambda x: 1.0 - (xm / np.maximum(x, xm)) ** alpha)
 
 # 6) Weibull(k_shape, lam): 1 - exp(-(x/lam)^k), x >= 0
 def G_weibull(k_shape, lam):
     if k_shape <= 0 or lam <= 0: raise ValueError("shape, scale must be > 0")
-    return lambda x: 1.0 - math.exp(- (max(x, 0.0) / lam) ** k_shape)
+    def _G_arr(x):
+        with np.errstate(over="ignore"):
+            return 1.0 - np.exp(- (np.maximum(x, 0.0) / lam) ** k_shape)
+    return _ufunc(lambda x: 1.0 - math.exp(- (max(x, 0.0) / lam) ** k_shape), _G_arr)
 
 # 7) Logistic(mu, s): 1/(1 + exp(-(x-mu)/s))
 def G_logistic(mu, s):
     if s <= 0: raise ValueError("scale s must be > 0")
-    return lambda x: 1.0 / (1.0 + math.exp(-(x - mu) / s))
+    def _G_arr(x):
+        with np.errstate(over="ignore"):
+            return 1.0 / (1.0 + np.exp(-(x - mu) / s))
+    return _ufunc(lambda x: 1.0 / (1.0 + math.exp(-(x - mu) / s)), _G_arr)
 
 # 8) Beta(alpha, beta) on [0,1]: exact needs betainc; else use a proxy
 # Preferred (exact) if SciPy is available:
@@ -135,20 +297,26 @@ try:
     from scipy.special import betainc  # regularized incomplete beta
     def G_beta(alpha, beta_):
         if alpha <= 0 or beta_ <= 0: raise ValueError("alpha,beta must be > 0")
-        return lambda x: betainc(alpha, beta_, min(max(x, 0.0), 1.0))
+        return _ufunc(
+            lambda x: betainc(alpha, beta_, min(max(x, 0.0), 1.0)),
+            lambda x: betainc(alpha, beta_, np.clip(x, 0.0, 1.0)),
+        )
 except Exception:
     # Fallback: monotone logit proxy (works OK away from 0/1) or ECDF (recommended)
     def G_beta(alpha, beta_):
         # WARNING: proxy; consider using ECDF if you lack SciPy
         eps = 1e-9
         def logit(u): return math.log(u/(1.0-u))
+        def _G_arr(x):
+            u = np.clip(x, eps, 1.0-eps)
+            return 1.0 / (1.0 + np.exp(-np.log(u/(1.0-u))))
         # map to roughly uniform via logit, then to [0,1] with a squashing
-        return lambda x: 1.0 / (1.0 + math.exp(-logit(min(max(x, eps), 1.0-eps))))
+        return _ufunc(lambda x: 1.0 / (1.0 + math.exp(-logit(min(max(x, eps), 1.0-eps)))), _G_arr)
 
 # 9) Zipf / discrete power-law: practical proxies
 # (a) simple log transform (robust, parameter-free)
 def G_zipf_log():
-    return lambda x: math.log(max(x, 1.0))
+    return _ufunc(lambda x: math.log(max(x, 1.0)), lambda x: np.log(np.maximum(x, 1.0)))
 
 # (b) continuous Pareto surrogate with alpha and xmin
 def G_zipf_pareto_surrogate(xmin, alpha):
@@ -157,8 +325,47 @@ def G_zipf_pareto_surrogate(xmin, alpha):
 # 10) Box–Cox transform: (x^λ - 1)/λ  (λ→0 gives log)
 def G_boxcox(lmbd):
     if abs(lmbd) < 1e-12:
-        return lambda x: math.log(max(x, 1e-300))
-    return lambda x: (max(x, 0.0) ** lmbd - 1.0) / lmbd
+        return _ufunc(lambda x: math.log(max(x, 1e-300)), lambda x: np.log(np.maximum(x, 1e-300)))
+    return _ufunc(
+        lambda x: (max(x, 0.0) ** lmbd - 1.0) / lmbd,
+        lambda x: (np.maximum(x, 0.0) ** lmbd - 1.0) / lmbd,
+    )
+
+# 11) Empirical CDF: piecewise-linear through n_knots keys sampled from arr
+#     Scalar lookup is a bisect over the knots (O(log n_knots));
+#     arrays go through np.interp. Memory: 2 floats per knot.
+def G_ecdf(arr, n_knots=256):
+    return G_ecdf_from_knots(*ecdf_knots(arr, n_knots))
+
+def ecdf_knots(arr, n_knots=256):
+    # (xk, yk): the knot keys and their normalized positions, as float64
+    n = len(arr)
+    if n == 0: raise ValueError("arr must be non-empty")
+    idx = np.unique(np.linspace(0, n - 1, max(2, min(n_knots, n))).astype(np.intp))
+    xk = np.asarray(arr)[idx].astype(np.float64)
+    yk = idx / max(n - 1, 1)
+
+    # Tied keys: keep the first knot of each run so x -> its first position
+    xk, first = np.unique(xk, return_index=True)
+    return xk, yk[first]
+
+def G_ecdf_from_knots(xk, yk):
+    # G_ecdf rebuilt from stored knots (see disk_index), without touching arr
+    xk = np.asarray(xk, dtype=np.float64)
+    yk = np.asarray(yk, dtype=np.float64)
+    if xk.size == 1:
+        return lambda x: x * 0.0
+
+    xs, ys = xk.tolist(), yk.tolist()
+    last = len(xs) - 1
+    def _G(x):
+        i = bisect_right(xs, x)
+        if i == 0: return ys[0]
+        if i > last: return ys[last]
+        x0, y0 = xs[i - 1], ys[i - 1]
+        return y0 + (ys[i] - y0) * (x - x0) / (xs[i] - x0)
+    return _ufunc(_G, lambda x: np.interp(x, xk, yk))
+
 
 
 
@@ -169,39 +376,55 @@ def G_boxcox(lmbd):
 
 
 
+# ---------- Closed-form parameter fits (vectorized) ----------
 
 def fit_normal(arr):
-    n = len(arr)
-    mu = sum(arr)/n
-    var = sum((x-mu)**2 for x in arr)/(n-1 if n>1 else 1)
+    x = np.asarray(arr, dtype=np.float64)
+    n = x.size
+    mu = float(x.mean())
+    var = float(((x-mu)**2).sum())/(n-1 if n>1 else 1)
     return mu, math.sqrt(max(var, 1e-300))
 
 def fit_exponential(arr):                # assume x >= 0
-    mean = sum(arr)/len(arr)
+    mean = float(np.asarray(arr, dtype=np.float64).mean())
     return 1.0 / max(mean, 1e-300)
 
 def fit_lognormal(arr):                  # assume x > 0
-    logs = [math.log(max(x, 1e-300)) for x in arr]
-    n = len(logs)
-    mu = sum(logs)/n
-    var = sum((z-mu)**2 for z in logs)/(n-1 if n>1 else 1)
+    logs = np.log(np.maximum(np.asarray(arr, dtype=np.float64), 1e-300))
+    n = logs.size
+    mu = float(logs.mean())
+    var = float(((logs-mu)**2).sum())/(n-1 if n>1 else 1)
     return mu, math.sqrt(max(var, 1e-300))
 
 def fit_pareto(arr, xmin=None):          # Hill estimator
-    xs = [x for x in arr if x > 0]
-    if not xs: return 1.0, 1.0
-    xm = xmin if xmin is not None else min(xs)
-    ys = [math.log(x/xm) for x in xs if x >= xm]
-    denom = sum(ys)
-    alpha = len(ys) / max(denom, 1e-300)
+    x = np.asarray(arr, dtype=np.float64)
+    xs = x[x > 0]
+    if not xs.size: return 1.0, 1.0
+    xm = xmin if xmin is not None else float(xs.min())
+    ys = np.log(xs[xs >= xm]/xm)
+    denom = float(ys.sum())
+    alpha = ys.size / max(denom, 1e-300)
     return xm, max(alpha, 1e-6)
 
+def fit_weibull(arr):                    # assume x > 0; Weibull-plot regression
+    xs = np.sort(np.asarray(arr, dtype=np.float64))
+    xs = xs[xs > 0]
+    n = xs.size
+    if n < 2 or xs[0] == xs[-1]: return 1.0, max(float(xs.mean()) if n else 1.0, 1e-300)
+    # ln(-ln(1 - F)) = k ln x - k ln lam, with plotting positions F = (i+0.5)/n
+    F = (np.arange(n) + 0.5) / n
+    lx = np.log(xs)
+    ly = np.log(-np.log1p(-F))
+    k_shape, icpt = np.polyfit(lx, ly, 1)
+    k_shape = max(float(k_shape), 1e-6)
+    return k_shape, math.exp(-icpt / k_shape)
+
 def fit_logistic(arr):
-    xs = sorted(arr)
-    n = len(xs)
-    median = xs[n//2] if n % 2 else 0.5*(xs[n//2-1]+xs[n//2])
+    xs = np.sort(np.asarray(arr, dtype=np.float64))
+    n = xs.size
+    median = float(xs[n//2] if n % 2 else 0.5*(xs[n//2-1]+xs[n//2]))
     q1 = xs[n//4]
     q3 = xs[(3*n)//4]
-    iqr = max(q3 - q1, 1e-300)
+    iqr = max(float(q3 - q1), 1e-300)
     s = iqr / (2.0*math.log(3.0))  # logistic IQR = 2 s ln 3
     return median, s
@@ -0,0 +1,123 @@
+## On-disk KAPS index: a raw sorted key file opened with np.memmap,
+## plus a small JSON sidecar describing the keys and the fitted model.
+##
+##   keys.bin            raw keys, exactly as arr.tofile() writes them
+##   keys.bin.kaps.json  {"format", "dtype", "length", "lkaps_key",
+##                        "G_key", "k", "divisor"}, plus "ecdf_knots"
+##                        {"x", "y"} when the model is an empirical CDF
+##
+## Opening maps the file without reading it; lookups only fault in the
+## pages they probe, and every process mapping the same file shares the
+## OS page cache.
+
+import json
+import os
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps, ecdf_knots, G_ecdf_from_knots
+from .batch_kaps import dd_kaps_batch
+from .lkaps_to_gchoice import make_G_from_lkaps, resolve_lkaps_key
+
+SIDECAR_SUFFIX = ".kaps.json"
+FORMAT_VERSION = 1
+
+
+def sidecar_path(path):
+    return os.fspath(path) + SIDECAR_SUFFIX
+
+
+def save_index(path, arr, lkaps_key=None, k=20, divisor=2):
+    """
+    Writes arr (sorted) to `path` and its sidecar next to it.
+
+    lkaps_key : L-KAPS choice, e.g. lkaps(arr)[0]; None runs lkaps_fit.
+                Its parameters are resolved against arr and stored, so
+                opening never has to refit on the full array. For an
+                ("ecdf", n) key the knots themselves are stored, so
+                opening doesn't resample them from the mapped file.
+    """
+    arr = np.ascontiguousarray(arr)
+    if arr.ndim != 1 or arr.size == 0:
+        raise ValueError("arr must be a non-empty 1-D array")
+
+    if lkaps_key is None:
+        from .l_kaps import lkaps_fit
+        lkaps_key = lkaps_fit(arr)[0]
+    G_key = resolve_lkaps_key(arr, lkaps_key)
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "dtype": arr.dtype.str,
+        "length": int(arr.size),
+        "lkaps_key": _to_json_key(lkaps_key),
+        "G_key": _to_json_key(G_key),
+        "k": int(k),
+        "divisor": int(divisor),
+    }
+    if G_key[0] == "ecdf":
+        xk, yk = ecdf_knots(arr, *G_key[1:])
+        meta["ecdf_knots"] = {"x": xk.tolist(), "y": yk.tolist()}
+
+    arr.tofile(path)
+
+    # Write-then-rename so readers never see a half-written sidecar
+    side = sidecar_path(path)
+    tmp = side + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, side)
+    return meta
+
+
+def open_index(path):
+    """Maps a saved index read-only; see MappedKapsIndex."""
+    with open(sidecar_path(path)) as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(f"unsupported index format: {meta.get('format')}")
+    return MappedKapsIndex(path, meta)
+
+
+class MappedKapsIndex:
+    """
+    A saved index, memory-mapped.
+
+    arr       : np.memmap over the key file (zero-copy, read-only)
+    lkaps_key : the L-KAPS choice recorded at save time
+    G         : transform rebuilt from the stored parameters
+    """
+
+    def __init__(self, path, meta):
+        self.path = os.fspath(path)
+        self.meta = meta
+        self.arr = np.memmap(self.path, dtype=np.dtype(meta["dtype"]), mode="r",
+                             shape=(meta["length"],))
+        self.lkaps_key = tuple(meta["lkaps_key"])
+        self.G_key = tuple(meta["G_key"])
+        self.k = meta["k"]
+        self.divisor = meta["divisor"]
+        knots = meta.get("ecdf_knots")
+        if knots is not None:
+            self.G = G_ecdf_from_knots(knots["x"], knots["y"])
+        else:
+            self.G = make_G_from_lkaps(self.arr, self.G_key)
+
+    def __len__(self):
+        return self.arr.size
+
+    def search(self, target):
+        """Returns (index, depth) for one target, like dd_kaps."""
+        return dd_kaps(0, self.arr.size - 1, self.arr, target, self.k, self.divisor, self.G)
+
+    def search_batch(self, targets):
+        """Returns (index, depth) arrays for many targets, like dd_kaps_batch."""
+        return dd_kaps_batch(self.arr, targets, self.k, self.divisor, self.G)
+
+
+def _to_json_key(key):
+    # ('normal', np.float64(0.1), 2) -> ["normal", 0.1, 2]
+    out = [str(key[0])]
+    for p in key[1:]:
+        out.append(p.item() if isinstance(p, np.generic) else p)
+    return out
@@ -0,0 +1,99 @@
+## Model drift detection: compares the rolling per-query search depth
+## against the depth the model achieved when it was fitted, and flags
+## when the fitted G has stopped matching the data.
+
+from collections import deque
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps
+
+
+def fit_depths(arr, G, k=20, divisor=2, n_samples=256, seed=0):
+    """
+    Per-query DD-KAPS depths of G on n_samples keys drawn uniformly at
+    random from arr, at the index's own k and divisor. The lkaps
+    checkpoints are packed toward the ends of the array, so their depths
+    don't describe a live mix of present-key lookups; lkaps' best_value
+    also sums over k = 2..64, so neither is comparable with live queries.
+    """
+    n = len(arr)
+    if n == 0:
+        return [0]
+    pos = np.random.default_rng(seed).integers(0, n, n_samples)
+    return [dd_kaps(0, n - 1, arr, arr[i], k, divisor, G)[1] for i in pos]
+
+
+class DriftMonitor:
+    """
+    Rolling window of live query depths versus the fit-time baseline.
+
+    baseline    : per-query depths measured at fit time (see fit_depths)
+    fit_value   : lkaps best_value for the fit, kept for reporting
+    window      : number of recent queries to keep
+    mean_ratio  : degrade when rolling mean > mean_ratio * baseline mean
+    tail_ratio  : ... or rolling tail > tail_ratio * baseline tail
+    tail        : quantile used for the tail (0.99 = p99)
+    min_samples : don't judge before this many queries
+    check_every : recompute the statistics every N records
+
+    record() is O(1) apart from the periodic check.
+    """
+
+    def __init__(self, baseline, fit_value=None, window=1024, mean_ratio=1.25,
+                 tail_ratio=1.5, tail=0.99, min_samples=256, check_every=64):
+        self.window = window
+        self.mean_ratio = mean_ratio
+        self.tail_ratio = tail_ratio
+        self.tail = tail
+        self.min_samples = min_samples
+        self.check_every = check_every
+        self.reset(baseline, fit_value)
+
+    def reset(self, baseline, fit_value=None):
+        """Starts over against a new fit-time baseline."""
+        base = np.asarray(baseline, dtype=np.float64)
+        self.baseline_mean = float(base.mean())
+        self.baseline_tail = float(np.quantile(base, self.tail))
+        self.fit_value = fit_value
+        self._depths = deque(maxlen=self.window)
+        self._since_check = 0
+        self.degraded = False
+
+    def accept(self, fit_value=None):
+        """
+        Takes the current rolling window as the new baseline, for when a
+        refit could not do better than the model already in place: the
+        monitor then only fires again if lookups degrade further.
+        """
+        if self._depths:
+            self.reset(list(self._depths), fit_value)
+        else:
+            self.degraded = False
+
+    def record(self, depth):
+        """Adds one query's depth; returns True once the model has degraded."""
+        self._depths.append(depth)
+        self._since_check += 1
+        if self._since_check >= self.check_every and len(self._depths) >= self.min_samples:
+            self._since_check = 0
+            mean, tail = self._rolling()
+            self.degraded = (mean > self.mean_ratio * self.baseline_mean
+                             or tail > self.tail_ratio * self.baseline_tail)
+        return self.degraded
+
+    def stats(self):
+        mean, tail = self._rolling() if self._depths else (0.0, 0.0)
+        return {
+            "mean_depth": mean,
+            "tail_depth": tail,
+            "baseline_mean": self.baseline_mean,
+            "baseline_tail": self.baseline_tail,
+            "fit_value": self.fit_value,
+            "samples": len(self._depths),
+            "degraded": self.degraded,
+        }
+
+    def _rolling(self):
+        d = np.fromiter(self._depths, dtype=np.float64, count=len(self._depths))
+        return float(d.mean()), float(np.quantile(d, self.tail))
@@ -0,0 +1,81 @@
+## Finger search for sorted query streams: each lookup starts from the
+## previous answer instead of the whole array, gallops forward with
+## steps sized in G-space, then refines the bracket with the KAPS
+## lower-bound descent. Dense ascending streams cost O(1) probes per key.
+
+from .dd_kaps import G_uniform
+from .range_scan import kaps_lower_bound
+
+
+def finger_search(arr, targets, k=20, divisor=2, G=None):
+    """
+    Lazily yields (index, depth) for each target of an ascending
+    iterable, like dd_kaps (index is -1 when the target is absent;
+    with duplicate keys it is the first occurrence).
+
+    The finger is the insertion position of the previous target. The
+    first gallop step is the distance G predicts between the finger and
+    the target; it doubles until it passes the target. A target smaller
+    than the previous one restarts from the front of the array.
+
+    depth counts gallop probes plus the KAPS refinement levels.
+    """
+    n = len(arr)
+    if G is None:
+        G = G_uniform()
+    if n == 0:
+        for _ in targets:
+            yield -1, 0
+        return
+
+    last = arr[n - 1]
+    G_last = G(last)
+    f = 0
+    prev = None
+
+    for t in targets:
+        if prev is not None and t < prev:
+            f = 0
+        prev = t
+
+        # Finger already at (or past) the target: answered in one probe
+        depth = 1
+        if f == n:
+            yield -1, depth
+            continue
+        if arr[f] >= t:
+            yield (f if arr[f] == t else -1), depth
+            continue
+
+        if last < t:
+            f = n
+            yield -1, depth
+            continue
+
+        # Invariant: arr[lo] < t <= arr[hi]
+        step = _predicted_step(G, arr[f], G_last, t, n - 1 - f)
+        lo, hi = f, min(f + step, n - 1)
+        depth += 1
+        while arr[hi] < t:
+            depth += 1
+            lo = hi
+            step *= 2
+            hi = min(lo + step, n - 1)
+
+        f, d = kaps_lower_bound(arr, t, k, divisor, G, lo=lo + 1, hi=hi + 1)
+        depth += d
+        yield (f if arr[f] == t else -1), depth
+
+
+def _predicted_step(G, a, G_last, t, span):
+    # Positions G puts between a and t, if a + span is the last key
+    try:
+        Ga = G(a)
+        denom = G_last - Ga
+        if denom > 0:
+            step = span * (G(t) - Ga) / denom
+            if step >= 1:
+                return int(min(step, span))
+    except (ArithmeticError, ValueError):
+        pass
+    return 1
@@ -0,0 +1,161 @@
+## On-disk cache of L-KAPS fits, keyed by a cheap array fingerprint,
+## so restarted or horizontally scaled workers reuse one model
+## selection instead of each rerunning lkaps on the same data.
+
+import functools
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .l_kaps import lkaps
+from .lkaps_to_gchoice import make_G_from_lkaps, resolve_lkaps_key
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def fingerprint(arr, n_quantiles=64):
+    """
+    Hash of length, dtype and n_quantiles evenly spaced keys of the
+    sorted array. Reads n_quantiles elements, never the whole array.
+    """
+    arr = np.asarray(arr)
+    n = arr.size
+    h = hashlib.sha1()
+    h.update(f"{n}:{arr.dtype.str}:".encode())
+    if n:
+        idx = np.linspace(0, n - 1, min(n_quantiles, n)).astype(np.intp)
+        h.update(np.ascontiguousarray(arr[idx]).tobytes())
+    return h.hexdigest()
+
+
+def default_cache_dir():
+    return os.environ.get("KAPS_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "kaps")
+
+
+class FitCache:
+    """
+    One small JSON file per fit under `directory`. When the directory
+    grows past max_bytes, the least recently used entries are evicted
+    (reads refresh an entry's mtime).
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key, entry):
+        # Write-then-rename so concurrent readers never see half a file
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def cached_lkaps(arr, cache=None, fit=lkaps, name=None):
+    """
+    fit(arr) (lkaps by default), served from the cache when an array
+    with the same fingerprint was fitted with the same fit before.
+
+    name identifies fit in the cache key. It defaults to the function's
+    qualified name, plus the bound arguments for a functools.partial;
+    lambdas, nested functions and other callables need an explicit name.
+
+    Returns (best_key, best_value) like lkaps. The cache entry also
+    stores the resolved G parameters; see cached_G.
+    """
+    return _cached_entry(arr, cache, fit, name)[:2]
+
+
+def cached_G(arr, cache=None, fit=lkaps, name=None):
+    """G for arr, rebuilt from cached fitted parameters when possible."""
+    return make_G_from_lkaps(arr, _cached_entry(arr, cache, fit, name)[2])
+
+
+def fit_name(fit):
+    """
+    Stable description of fit for cache keys, e.g. "kaps.l_kaps.lkaps"
+    or "kaps.l_kaps.lkaps_halving(eta=2)". Raises ValueError when fit
+    has no such name (see cached_lkaps).
+    """
+    if isinstance(fit, functools.partial):
+        args = [repr(a) for a in fit.args]
+        args += [f"{k}={v!r}" for k, v in sorted(fit.keywords.items())]
+        return f"{fit_name(fit.func)}({', '.join(args)})"
+    qualname = getattr(fit, "__qualname__", None)
+    if qualname is None or "<" in qualname:
+        raise ValueError(f"can't derive a cache name for {fit!r}; pass name=")
+    return f"{fit.__module__}.{qualname}"
+
+
+def _cached_entry(arr, cache, fit, name=None):
+    if cache is None:
+        cache = FitCache()
+
+    name = name or fit_name(fit)
+    short = getattr(getattr(fit, "func", fit), "__name__", "")
+    short = short if short.isidentifier() else "fit"
+    digest = hashlib.sha1(name.encode()).hexdigest()[:12]
+    key = f"{short}-{digest}-{fingerprint(arr)}"
+    entry = cache.get(key)
+    if entry is None:
+        best_key, best_value = fit(arr)
+        entry = {
+            "fit": name,
+            "best_key": _to_json(best_key),
+            "best_value": _to_json(best_value),
+            "G_key": _to_json(resolve_lkaps_key(arr, best_key)),
+        }
+        cache.put(key, entry)
+
+    return tuple(entry["best_key"]), entry["best_value"], tuple(entry["G_key"])
+
+
+def _to_json(value):
+    if isinstance(value, (tuple, list)):
+        return [_to_json(v) for v in value]
+    return value.item() if isinstance(value, np.generic) else value
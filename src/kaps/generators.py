@@ -23,7 +23,7 @@ def gen_normal(N, mu=0, sigma=0.1):
 
 def gen_exponential(N, lmbd=1):
     # note: scale = lmbd (mean), matching your original
-    x = np.random.default_rng().exponential(scale=lmbd, size=N)
+    x = np.random.exponential(scale=lmbd, size=N)
     return np.sort(x)
 
 
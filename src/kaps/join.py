@@ -0,0 +1,106 @@
+## Intersection and merge-join of two sorted key columns. The smaller
+## side probes the larger one with the KAPS lower/upper-bound descent
+## under the larger side's fitted model; when the sizes are close, a
+## plain np.searchsorted pass is cheaper than fitting and is used instead.
+
+import numpy as np
+
+from .range_scan import kaps_bound_batch
+from .searchsorted import _model_to_G
+
+
+def kaps_intersect(a, b, model=None, k=20, divisor=2, min_ratio=8):
+    """
+    Keys present in both sorted arrays.
+
+    Returns (common, ia, ib) like np.intersect1d(a, b, return_indices=True):
+    the unique common keys in ascending order and the index of their
+    first occurrence in a and in b.
+
+    model     : G or L-KAPS key for the larger side; None fits one
+    min_ratio : probe with KAPS only when the larger side has at least
+                this many times more keys; otherwise use np.searchsorted
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    swap = a.size > b.size
+    small, large = (b, a) if swap else (a, b)
+
+    # First occurrence of each distinct key on the small side
+    s_idx = _run_starts(small)
+    keys = small[s_idx]
+
+    bounds = _prober(large, keys.size, model, k, divisor, min_ratio)
+    lo = bounds(keys, "left")
+    hit = lo < large.size
+    hit[hit] = large[lo[hit]] == keys[hit]
+
+    common = keys[hit]
+    i_small, i_large = s_idx[hit], lo[hit]
+    if swap:
+        return common, i_large, i_small
+    return common, i_small, i_large
+
+
+def kaps_join(a, b, model=None, k=20, divisor=2, min_ratio=8):
+    """
+    Inner equi-join of two sorted arrays: every pair (i, j) with a[i] == b[j].
+
+    Returns (ia, ib), ordered by key, then i, then j. Duplicate keys
+    produce their full cross product. The output size is counted first,
+    so both index arrays are allocated once at their final length.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    swap = a.size > b.size
+    small, large = (b, a) if swap else (a, b)
+
+    # Runs of equal keys on the small side: start and length
+    s_lo = _run_starts(small)
+    s_cnt = np.diff(np.append(s_lo, small.size))
+    keys = small[s_lo]
+
+    # Matching run on the large side
+    bounds = _prober(large, keys.size, model, k, divisor, min_ratio)
+    l_lo = bounds(keys, "left")
+    hit = l_lo < large.size
+    hit[hit] = large[l_lo[hit]] == keys[hit]
+    s_lo, s_cnt, l_lo = s_lo[hit], s_cnt[hit], l_lo[hit]
+    l_cnt = bounds(keys[hit], "right") - l_lo
+
+    if swap:
+        a_lo, a_cnt, b_lo, b_cnt = l_lo, l_cnt, s_lo, s_cnt
+    else:
+        a_lo, a_cnt, b_lo, b_cnt = s_lo, s_cnt, l_lo, l_cnt
+
+    pairs = a_cnt * b_cnt
+    total = int(pairs.sum())
+    ia = np.empty(total, dtype=np.intp)
+    ib = np.empty(total, dtype=np.intp)
+    if total == 0:
+        return ia, ib
+
+    # Output slot -> (group, offset r within the group's a_cnt x b_cnt block)
+    group = np.repeat(np.arange(pairs.size), pairs)
+    starts = np.cumsum(pairs) - pairs
+    r = np.arange(total) - starts[group]
+    bc = b_cnt[group]
+    np.add(a_lo[group], r // bc, out=ia)
+    np.add(b_lo[group], r % bc, out=ib)
+    return ia, ib
+
+
+def _run_starts(arr):
+    # Index of the first key of each run of equal keys
+    if arr.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    new = np.empty(arr.size, dtype=bool)
+    new[0] = True
+    np.not_equal(arr[1:], arr[:-1], out=new[1:])
+    return np.flatnonzero(new)
+
+
+def _prober(large, n_keys, model, k, divisor, min_ratio):
+    # bounds(keys, side) -> insertion positions of keys in large
+    if n_keys == 0 or large.size < max(2, min_ratio * n_keys):
+        return lambda keys, side: np.searchsorted(large, keys, side)
+    G = _model_to_G(large, model)
+    return lambda keys, side: kaps_bound_batch(large, keys, side, k, divisor, G)[0]
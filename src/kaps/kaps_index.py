@@ -0,0 +1,55 @@
+## Prebuilt DD-KAPS index: caches G(arr) once so every lookup only
+## evaluates G on the target instead of on both window endpoints
+## at every level.
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps, apply_G
+from .batch_kaps import dd_kaps_batch
+
+
+class KapsIndex:
+    """
+    Reusable DD-KAPS index over a sorted array.
+
+    arr      : the sorted data array
+    G        : transform used to interpolate (e.g. from make_G_from_lkaps)
+    k        : bucket count per level
+    divisor  : how fast k shrinks on small windows
+    cutoff   : windows with hi - lo < cutoff are scanned (see dd_kaps);
+               "auto" tunes cutoff and scan for arr's dtype
+    scan     : scan method for those windows (see scan_window)
+    guard    : None, or a fraction (e.g. 0.5) enabling dd_kaps' guarded
+               mode, which bounds a lookup at ~2*log2(n) levels
+
+    G(arr) is stored as a float64 buffer (8 bytes per key), so a lookup
+    costs one G evaluation instead of three per level.
+    """
+
+    def __init__(self, arr, G, k=20, divisor=2, cutoff=1, scan="linear", guard=None):
+        self.arr = arr
+        self.G = G
+        self.k = k
+        self.divisor = divisor
+        self.G_arr = np.ascontiguousarray(apply_G(G, arr), dtype=np.float64)
+        if cutoff == "auto":
+            from .autotune import cutoff_for
+            cutoff, scan = cutoff_for(arr, G, k, divisor, G_arr=self.G_arr)
+        self.cutoff = cutoff
+        self.scan = scan
+        self.guard = guard
+
+    def __len__(self):
+        return len(self.arr)
+
+    def search(self, target):
+        """Returns (index, depth) for one target, like dd_kaps."""
+        return dd_kaps(0, len(self.arr) - 1, self.arr, target, self.k, self.divisor,
+                       self.G, G_arr=self.G_arr, cutoff=self.cutoff, scan=self.scan,
+                       guard=self.guard)
+
+    def search_batch(self, targets):
+        """Returns (index, depth) arrays for many targets, like dd_kaps_batch."""
+        return dd_kaps_batch(self.arr, targets, self.k, self.divisor,
+                             self.G, G_arr=self.G_arr, cutoff=self.cutoff, scan=self.scan,
+                             guard=self.guard)
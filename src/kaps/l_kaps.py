@@ -1,15 +1,24 @@
+import math
+import random
+
+import numpy as np
+
 from . import dd_kaps
 from .dd_kaps import *
+from .lkaps_to_gchoice import make_G_from_lkaps
 
 
 # ---------------------------------------------------------
 # Build a dictionary mapping distribution names → generator
 # ---------------------------------------------------------
-def distributionList():
+def distributionList(arr=None):
     """
     Creates and returns a dictionary of distribution generator
     functions for use in L-KAPS. Each entry corresponds to a
     specific parameterization of a distribution.
+
+    Passing the sorted array also adds empirical-CDF candidates,
+    whose knots are sampled from it.
     """
 
     dists = {}
@@ -80,52 +89,48 @@ def distributionList():
         dists[name] = G_zipf_pareto_surrogate(xmin=1, alpha=a)
 
     # ---------------------------------------------------------
-    # Box–Cox family (under development)
+    # Box–Cox family (grid; see optimize_family for continuous λ)
     # ---------------------------------------------------------
-    # for l in [-2, -1, -0.5, 0, 0.5, 1, 2]:
-    #     name = f"boxcox_lambda{l}"
-    #     dists[name] = G_boxcox(lmbd=l)
+    for l in [-2, -1, -0.5, 0, 0.5, 1, 2]:
+        name = ("boxcox", l)
+        dists[name] = G_boxcox(lmbd=l)
+
+    # ---------------------------------------------------------
+    # Empirical CDF (needs the data itself)
+    # ---------------------------------------------------------
+    if arr is not None and len(arr) > 0:
+        for n_knots in [64, 256, 1024]:
+            name = ("ecdf", n_knots)
+            dists[name] = G_ecdf(arr, n_knots=n_knots)
 
     return dists
 
 
 
 # ---------------------------------------------------------
-# L-KAPS core function
-# Tests each distribution by computing total search depth
-# across many quantiles × k-values
+# Scoring grid shared by every L-KAPS mode
 # ---------------------------------------------------------
-def lkaps(arr):
-    """
-    Returns the best-fitting distribution for arr by computing
-    the total search depth of K-Array Predictive Search across
-    multiple quantiles and k-values.
-    Lower total search depth = better match.
-    """
 
-    # Percentile checkpoints at which to probe array values
-    positionCheckpoints = [
-        0.1, 0.3, 0.5, 0.7, 0.9, 1.3, 1.8, 2.5, 3.5,
-        5, 7, 10, 15, 20, 25, 30, 40, 50, 60, 70, 75,
-        80, 85, 90, 92, 95, 97, 98, 99, 99.5, 99.8, 99.9
-    ]
+# Percentile checkpoints at which to probe array values
+POSITION_CHECKPOINTS = [
+    0.1, 0.3, 0.5, 0.7, 0.9, 1.3, 1.8, 2.5, 3.5,
+    5, 7, 10, 15, 20, 25, 30, 40, 50, 60, 70, 75,
+    80, 85, 90, 92, 95, 97, 98, 99, 99.5, 99.8, 99.9
+]
 
-    # k-values for KAPS search depth evaluation
-    k_values = [2, 4, 8, 16, 32, 64]
+# k-values for KAPS search depth evaluation
+K_VALUES = [2, 4, 8, 16, 32, 64]
 
-    # Load all distributions
-    dists = distributionList()
 
-    # Dictionary storing total search depth
-    score = {}
-
-    # ---------------------------------------------------------
-    # Iterate over each distribution candidate
-    # ---------------------------------------------------------
-    for dist in dists:
+def score_distribution(arr, G, positionCheckpoints=POSITION_CHECKPOINTS, k_values=K_VALUES):
+    """
+    Total KAPS search depth for one candidate G over
+    every (checkpoint, k) pair. Lower = better match.
+    """
 
-        total_Depth = 0  # accumulated search depth across checkpoints
+    total_Depth = 0  # accumulated search depth across checkpoints
 
+    try:
         # Iterate over percentile checkpoints
         for pos in positionCheckpoints:
 
@@ -143,14 +148,49 @@ def lkaps(arr):
                     target,          # target element
                     k,               # k parameter
                     2,               # branching factor?
-                    dists[dist]      # distribution generator
+                    G                # distribution generator
                 )
 
                 depth = output[1]   # output = (value, depth)
                 total_Depth += depth
 
-        # Store total depth for this distribution
-        score[dist] = total_Depth
+    except (ArithmeticError, ValueError):
+        # G breaks down on this data (overflow, x^λ at 0, NaN bucket...)
+        return math.inf
+
+    return total_Depth
+
+
+
+# ---------------------------------------------------------
+# L-KAPS core function
+# Tests each distribution by computing total search depth
+# across many quantiles × k-values
+# ---------------------------------------------------------
+def lkaps(arr, workers=None):
+    """
+    Returns the best-fitting distribution for arr by computing
+    the total search depth of K-Array Predictive Search across
+    multiple quantiles and k-values.
+    Lower total search depth = better match.
+
+    workers > 1 scores the candidates in a process pool, with arr
+    shared through multiprocessing.shared_memory; the result is
+    identical to the serial run.
+    """
+
+    # Load all distributions
+    dists = distributionList(arr)
+
+    # Dictionary storing total search depth
+    if workers is not None and workers > 1:
+        score = _parallel_scores(arr, list(dists), workers)
+    else:
+        score = {}
+
+        # Iterate over each distribution candidate
+        for dist in dists:
+            score[dist] = score_distribution(arr, dists[dist])
 
     # ---------------------------------------------------------
     # Determine distribution with minimum total search depth
@@ -160,6 +200,319 @@ def lkaps(arr):
 
 
 
+# ---------------------------------------------------------
+# Continuous per-family optimization
+# Minimizes the same total-depth objective as lkaps over a
+# continuous parameter range instead of a fixed grid
+# ---------------------------------------------------------
+_PHI = (math.sqrt(5.0) - 1.0) / 2.0   # golden ratio conjugate
+
+
+def golden_section(f, lo, hi, iters=16, grid=9):
+    """
+    Minimizes f on [lo, hi]: a coarse grid brackets the best region,
+    then golden-section search refines inside that bracket.
+    Returns (x, f(x)).
+    """
+    xs = [lo + (hi - lo) * i / (grid - 1) for i in range(grid)]
+    fs = [f(x) for x in xs]
+    i = min(range(grid), key=lambda j: fs[j])
+    best_x, best_f = xs[i], fs[i]
+
+    a, b = xs[max(i - 1, 0)], xs[min(i + 1, grid - 1)]
+    c, d = b - _PHI * (b - a), a + _PHI * (b - a)
+    fc, fd = f(c), f(d)
+    for _ in range(iters):
+        if fc <= fd:
+            b, d, fd = d, c, fc
+            c = b - _PHI * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + _PHI * (b - a)
+            fd = f(d)
+        for x, fx in ((c, fc), (d, fd)):
+            if fx < best_f:
+                best_x, best_f = x, fx
+    return best_x, best_f
+
+
+def _family_space(arr, family):
+    """
+    (make_key(param), lo, hi, log_scale) for one family, with the
+    location/scale anchors taken from the data so the search range
+    is relative to the keys themselves.
+    """
+    lo_x, hi_x = float(arr[0]), float(arr[-1])
+    median = float(arr[len(arr) // 2])
+    spread = max(hi_x - lo_x, 1e-300)
+
+    if family == "normal":
+        return (lambda s: ("normal", median, s)), spread * 1e-4, spread * 10, True
+    if family == "logistic":
+        return (lambda s: ("logistic", median, s)), spread * 1e-4, spread * 10, True
+    if family == "exponential":
+        return (lambda l: ("exponential", l)), 1e-2 / spread, 1e4 / spread, True
+    if lo_x <= 0:
+        return None   # the remaining families need strictly positive keys
+    if family == "lognormal":
+        return (lambda s: ("lognormal", math.log(median), s)), 1e-3, 20.0, True
+    if family == "pareto":
+        return (lambda a: ("pareto", lo_x, a)), 1e-2, 20.0, True
+    if family == "weibull":
+        # pin the scale so the model's median matches the data's median
+        return (lambda k: ("weibull", k, median / math.log(2.0) ** (1.0 / k))), 0.05, 20.0, True
+    if family == "boxcox":
+        return (lambda l: ("boxcox", l)), -2.0, 2.0, False
+    raise ValueError(f"unknown family: {family}")
+
+
+OPTIMIZED_FAMILIES = ["normal", "logistic", "exponential", "lognormal", "pareto", "weibull", "boxcox"]
+
+
+def optimize_family(arr, family, iters=16):
+    """
+    Best parameter for one family under the lkaps objective.
+    Returns (key, total_depth), or None if the family doesn't apply.
+    """
+    space = _family_space(arr, family)
+    if space is None:
+        return None
+    make_key, lo, hi, log_scale = space
+
+    if log_scale:
+        to_param = math.exp
+        lo, hi = math.log(lo), math.log(hi)
+    else:
+        to_param = float
+
+    def objective(t):
+        key = make_key(to_param(t))
+        try:
+            return score_distribution(arr, make_G_from_lkaps(arr, key))
+        except (ArithmeticError, ValueError):
+            return math.inf
+
+    t, value = golden_section(objective, lo, hi, iters=iters)
+    return make_key(to_param(t)), value
+
+
+def lkaps_optimize(arr, families=OPTIMIZED_FAMILIES, iters=16):
+    """
+    L-KAPS with continuous parameters: optimizes every family and
+    returns the overall (best_key, best_value). Keys are fully
+    parameterized, ready for make_G_from_lkaps.
+    """
+    score = {("uniform", 0): score_distribution(arr, G_uniform())}
+    for family in families:
+        result = optimize_family(arr, family, iters=iters)
+        if result is not None:
+            score[result[0]] = result[1]
+
+    best_key, best_value = min(score.items(), key=lambda x: x[1])
+    return best_key, best_value
+
+
+
+# ---------------------------------------------------------
+# Closed-form fast path
+# Fits each family directly on a quantile sample and ranks them
+# by how uniform G(sample) looks, with no KAPS runs at all
+# ---------------------------------------------------------
+# (name, smallest key the fit accepts, closed-form fit)
+_CLOSED_FORM_FITS = [
+    ("normal", -math.inf, fit_normal),
+    ("logistic", -math.inf, fit_logistic),
+    ("exponential", 0, lambda x: (fit_exponential(x),)),
+    ("lognormal", math.nextafter(0, 1), fit_lognormal),
+    ("pareto", math.nextafter(0, 1), fit_pareto),
+    ("weibull", math.nextafter(0, 1), fit_weibull),
+]
+
+
+def _fitted_families(x):
+    """
+    Fully-parameterized make_G_from_lkaps keys for the families that fit x.
+    Fits only see the finite keys, and a family whose fit fails is skipped.
+    """
+    keys = [("uniform", 0)]
+    x = x[np.isfinite(x)]
+    if x.size < 2:
+        return keys
+    for name, x_min, fit in _CLOSED_FORM_FITS:
+        if x[0] < x_min:
+            continue
+        try:
+            with np.errstate(all="ignore"):
+                keys.append((name,) + tuple(fit(x)))
+        except (ArithmeticError, ValueError):
+            continue
+    if x[0] > 0:
+        keys.append(("zipfLog", 0))
+    return keys
+
+
+def rank_distributions(arr, sample_size=1024):
+    """
+    Ranks the parametric families by a KS-style statistic in G-space.
+
+    For a perfect G, G(arr) rescaled to [0, 1] is a straight line over
+    the array positions, which is exactly what KAPS interpolation needs.
+    The statistic is the largest gap from that line on the sample.
+
+    Returns a list of (statistic, key) sorted best-first; empty when no
+    G spreads the sample at all (constant or single-key arrays).
+    """
+    n = len(arr)
+    idx = np.linspace(0, n - 1, min(sample_size, n)).astype(np.intp)
+    x = np.asarray(arr)[idx].astype(np.float64)
+    p = idx / max(n - 1, 1)
+
+    keys = _fitted_families(x)
+
+    ranking = []
+    for key in keys:
+        try:
+            with np.errstate(all="ignore"):
+                u = apply_G(make_G_from_lkaps(x, key), x)
+        except (ValueError, OverflowError, ZeroDivisionError):
+            continue
+        span = u[-1] - u[0]
+        if not np.isfinite(span) or span <= 0:
+            continue
+        stat = float(np.max(np.abs((u - u[0]) / span - p)))
+        if math.isfinite(stat):
+            ranking.append((stat, key))
+
+    ranking.sort(key=lambda r: r[0])
+    return ranking
+
+
+def lkaps_fit(arr, sample_size=1024):
+    """
+    Millisecond model selection: closed-form fits ranked in G-space.
+
+    Returns (best_key, best_statistic); best_key carries the fitted
+    parameters and can be passed straight to make_G_from_lkaps.
+    Falls back to ("uniform", 0) when no candidate ranks.
+    """
+    ranking = rank_distributions(arr, sample_size)
+    if not ranking:
+        return ("uniform", 0), math.inf
+    stat, key = ranking[0]
+    return key, stat
+
+
+
+# ---------------------------------------------------------
+# Successive halving
+# Scores every candidate on a few (checkpoint, k) pairs, keeps
+# the best 1/eta, and gives the survivors more pairs each round
+# ---------------------------------------------------------
+def lkaps_halving(arr, eta=3, budget=None):
+    """
+    Faster, adaptive version of lkaps.
+
+    eta    : keep the best 1/eta of the candidates after each round
+    budget : total dd_kaps evaluations to spend across all rounds
+             (default: a tenth of what the full lkaps sweep costs)
+
+    Returns (best_key, best_value) like lkaps; best_value is the
+    winner's full-grid score, so it is comparable with lkaps output.
+    """
+    dists = distributionList(arr)
+    candidates = list(dists)
+
+    # Every (checkpoint, k) pair, in a fixed shuffled order so that any
+    # prefix samples the whole key range and all k-values
+    pairs = [(pos, k) for pos in POSITION_CHECKPOINTS for k in K_VALUES]
+    random.Random(0).shuffle(pairs)
+    targets = [arr[int(pos * len(arr) / 100)] for pos, _ in pairs]
+
+    if budget is None:
+        budget = len(candidates) * len(pairs) // 10
+
+    rounds = max(1, math.ceil(math.log(len(candidates), eta)))
+    score = dict.fromkeys(candidates, 0)
+    used = 0   # pairs already scored by every survivor
+
+    for _ in range(rounds):
+        if len(candidates) == 1:
+            break
+
+        # Classic successive-halving allotment: budget / (|S| * rounds) pairs each
+        n = min(len(pairs), max(used + 1, budget // (len(candidates) * rounds)))
+        for dist in candidates:
+            G = dists[dist]
+            try:
+                for (_, k), target in zip(pairs[used:n], targets[used:n]):
+                    score[dist] += dd_kaps(0, len(arr) - 1, arr, target, k, 2, G)[1]
+            except (ArithmeticError, ValueError):
+                score[dist] = math.inf
+        used = n
+
+        # Stable sort keeps distributionList() order on ties, like lkaps' min()
+        candidates.sort(key=lambda d: score[d])
+        candidates = candidates[:max(1, math.ceil(len(candidates) / eta))]
+
+    best_key = min(candidates, key=lambda d: score[d])
+    return best_key, score_distribution(arr, dists[best_key])
+
+
+
+# ---------------------------------------------------------
+# Process-parallel scoring
+# The sorted array lives in one shared memory block that every
+# worker maps; only candidate keys and integer scores are pickled.
+# ---------------------------------------------------------
+_worker_state = {}
+
+def _init_worker(shm_name, shape, dtype):
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state["shm"] = shm      # keep the mapping alive
+    arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker_state["arr"] = arr
+    # G callables are closures and don't pickle; rebuild them per worker
+    _worker_state["dists"] = distributionList(arr)
+
+
+def _score_chunk(keys):
+    arr = _worker_state["arr"]
+    dists = _worker_state["dists"]
+    return [score_distribution(arr, dists[key]) for key in keys]
+
+
+def _parallel_scores(arr, keys, workers):
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    try:
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+
+        # Round-robin chunks so cheap and expensive families mix evenly
+        chunks = [keys[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, arr.shape, arr.dtype.str),
+        ) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Reassemble in distributionList() order so min() breaks ties the same way
+    chunk_scores = {}
+    for chunk, scores in zip(chunks, results):
+        chunk_scores.update(zip(chunk, scores))
+    return {key: chunk_scores[key] for key in keys}
+
+
+
 # -----------------------------
 # Example usage
 # -----------------------------
@@ -0,0 +1,161 @@
+## Two-stage learned index (RMI style): a root G model routes each key
+## to one of many small linear leaf models, and every leaf records its
+## worst position error. A lookup is one model evaluation followed by a
+## KAPS (or binary) search bounded to the leaf's error window.
+
+import math
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps, apply_G, G_uniform
+from .batch_kaps import dd_kaps_batch
+from .baselines import binary_search
+
+
+class LearnedIndex:
+    """
+    arr        : the sorted data array
+    G          : root model; None picks one with lkaps_fit, and
+                 G_uniform() gives a plain linear root
+    n_leaves   : number of leaf models (default: one per ~256 keys)
+    k, divisor : DD-KAPS settings for the last-mile search
+    last_mile  : "kaps" or "binary"
+
+    search() returns (index, depth) like dd_kaps; depth counts the
+    model evaluation as one level plus the levels of the bounded search.
+    search_batch() always finishes with dd_kaps_batch.
+    """
+
+    def __init__(self, arr, G=None, n_leaves=None, k=20, divisor=2, last_mile="kaps"):
+        if last_mile not in ("kaps", "binary"):
+            raise ValueError("last_mile must be 'kaps' or 'binary'")
+        self.arr = np.asarray(arr)
+        n = self.arr.size
+        if n == 0:
+            raise ValueError("arr must be non-empty")
+
+        if G is None:
+            from .l_kaps import lkaps_fit
+            from .lkaps_to_gchoice import make_G_from_lkaps
+            G = make_G_from_lkaps(self.arr, lkaps_fit(self.arr)[0])
+
+        self.G = G
+        self.k = k
+        self.divisor = divisor
+        self.last_mile = last_mile
+        self.n_leaves = n_leaves if n_leaves is not None else max(1, n // 256)
+
+        # ---- Root model: normalized G scaled to leaf ids ----
+        u = apply_G(G, self.arr)
+        self._u0 = float(u[0])
+        span = float(u[-1]) - self._u0
+        self._u_scale = self.n_leaves / span if span > 0 and math.isfinite(span) else 0.0
+        leaf = self._route(u)
+
+        # Leaves are contiguous position ranges [start, end) because G is monotone
+        L = self.n_leaves
+        start = np.searchsorted(leaf, np.arange(L), side="left")
+        end = np.searchsorted(leaf, np.arange(L), side="right")
+        self._fit_leaves(leaf, start, end)
+
+    # ---------- Build ----------
+    def _route(self, u):
+        r = np.nan_to_num((u - self._u0) * self._u_scale)
+        return np.clip(np.floor(r), 0, self.n_leaves - 1).astype(np.intp)
+
+    def _fit_leaves(self, leaf, start, end):
+        arr = self.arr
+        n = arr.size
+        L = self.n_leaves
+        pos = np.arange(n, dtype=np.float64)
+
+        # Keys are centred on each leaf's first key to keep the sums well conditioned
+        x0 = arr[np.minimum(start, n - 1)].astype(np.float64)
+        x = arr.astype(np.float64) - x0[leaf]
+
+        # Per-leaf least squares: pos ≈ slope * (key - x0) + icpt
+        cnt = np.bincount(leaf, minlength=L).astype(np.float64)
+        Sx = np.bincount(leaf, x, minlength=L)
+        Sy = np.bincount(leaf, pos, minlength=L)
+        Sxx = np.bincount(leaf, x * x, minlength=L)
+        Sxy = np.bincount(leaf, x * pos, minlength=L)
+        denom = cnt * Sxx - Sx * Sx
+        ok = denom > 0
+        slope = np.where(ok, (cnt * Sxy - Sx * Sy) / np.where(ok, denom, 1.0), 0.0)
+        icpt = np.where(cnt > 0, (Sy - slope * Sx) / np.maximum(cnt, 1.0), start.astype(np.float64))
+
+        # Worst error over each leaf's own keys ...
+        resid = pos - (slope[leaf] * x + icpt[leaf])
+        err_hi = np.zeros(L)
+        err_lo = np.zeros(L)
+        np.maximum.at(err_hi, leaf, resid)
+        np.maximum.at(err_lo, leaf, -resid)
+
+        # ... and over the keys just outside it, so a target whose root
+        # prediction rounds into a neighbouring (or empty) leaf is still covered
+        for nb in (start - 1, end):
+            nb = np.clip(nb, 0, n - 1)
+            r = nb - (slope * (arr[nb].astype(np.float64) - x0) + icpt)
+            err_hi = np.maximum(err_hi, r)
+            err_lo = np.maximum(err_lo, -r)
+
+        self._x0 = x0
+        self._slope = slope
+        self._icpt = icpt
+        self._err_lo = err_lo
+        self._err_hi = err_hi
+
+    # ---------- Lookup ----------
+    def max_error(self):
+        """Largest error window (in positions) over all leaves."""
+        return float(np.max(self._err_lo + self._err_hi))
+
+    def window(self, target):
+        """
+        Inclusive [lo, hi] positions that must hold target if present;
+        empty (lo > hi) for NaN and for targets outside [arr[0], arr[-1]].
+        """
+        last = self.arr.size - 1
+        if not self.arr[0] <= target <= self.arr[last]:
+            return 0, -1
+        r = (self.G(target) - self._u0) * self._u_scale
+        l = 0 if not r >= 0 else int(min(r, self.n_leaves - 1))
+        pred = self._slope[l] * (target - self._x0[l]) + self._icpt[l]
+        pred = min(max(pred, 0.0), last) if pred == pred else 0.0
+        lo = max(int(math.floor(pred - self._err_lo[l])) - 1, 0)
+        hi = min(int(math.ceil(pred + self._err_hi[l])) + 1, last)
+        return lo, hi
+
+    def search(self, target):
+        lo, hi = self.window(target)
+        if lo > hi:
+            return -1, 1
+        if self.last_mile == "binary":
+            idx, depth = binary_search(self.arr, lo, hi, target)
+        else:
+            idx, depth = dd_kaps(lo, hi, self.arr, target, self.k, self.divisor, G_uniform())
+        return idx, depth + 1
+
+    def search_batch(self, targets):
+        targets = np.asarray(targets)
+        shape = targets.shape
+        t = targets.ravel()
+        n = self.arr.size
+
+        # Out-of-range and NaN targets are rejected before G sees them
+        inside = (t >= self.arr[0]) & (t <= self.arr[n - 1])
+        t_in = np.where(inside, t, self.arr[0])
+
+        l = self._route(apply_G(self.G, t_in))
+        pred = self._slope[l] * (t_in.astype(np.float64) - self._x0[l]) + self._icpt[l]
+        pred = np.clip(np.nan_to_num(pred), 0, n - 1)
+        lo = np.maximum(np.floor(pred - self._err_lo[l]) - 1, 0).astype(np.intp)
+        hi = np.minimum(np.ceil(pred + self._err_hi[l]) + 1, n - 1).astype(np.intp)
+
+        index = np.full(t.size, -1, dtype=np.intp)
+        depth = np.ones(t.size, dtype=np.intp)
+        ok = inside & (lo <= hi)
+        idx, d = dd_kaps_batch(self.arr, t[ok], self.k, self.divisor, G_uniform(), lo=lo[ok], hi=hi[ok])
+        index[ok] = idx
+        depth[ok] += d
+        return index.reshape(shape), depth.reshape(shape)
@@ -1,22 +1,23 @@
-
-
 from .dd_kaps import *
 
-def make_G_from_lkaps(arr, lkaps_result):
-    
+def resolve_lkaps_key(arr, lkaps_result):
+
     """
     arr           : the sorted data array you're searching in
     lkaps_result  : tuple like ('uniform', 0) or ('pareto', 9.9) etc.
-    returns       : a callable G(x) suitable to pass as G_choice into kaps()
+    returns       : the same choice with every G parameter filled in,
+                    e.g. ('pareto', 1.0, 9.9), so the G can be rebuilt
+                    later without touching arr again (ecdf excepted:
+                    its knots are always resampled from arr)
     """
-    
+
     name = lkaps_result[0].lower()
     params = lkaps_result[1:]
 
     # ---- Uniform ----
     if name == "uniform":
         # parameter often unused; we just use identity CDF proxy
-        return G_uniform()
+        return ("uniform", 0)
 
     # ---- Normal ----
     if name == "normal":
@@ -24,7 +25,7 @@ def make_G_from_lkaps(arr, lkaps_result):
             mu, sigma = params[0], params[1]
         else:
             mu, sigma = fit_normal(arr)
-        return G_normal(mu, sigma)
+        return ("normal", mu, sigma)
 
     # ---- Exponential ----
     if name == "exponential":
@@ -32,7 +33,7 @@ def make_G_from_lkaps(arr, lkaps_result):
             lam = params[0]
         else:
             lam = fit_exponential(arr)
-        return G_exponential(lam)
+        return ("exponential", lam)
 
     # ---- Lognormal ----
     if name == "lognormal":
@@ -40,7 +41,7 @@ def make_G_from_lkaps(arr, lkaps_result):
             mu, sigma = params[0], params[1]
         else:
             mu, sigma = fit_lognormal(arr)
-        return G_lognormal(mu, sigma)
+        return ("lognormal", mu, sigma)
 
     # ---- Pareto ----
     if name == "pareto":
@@ -53,18 +54,15 @@ def make_G_from_lkaps(arr, lkaps_result):
             xm, _alpha_est = fit_pareto(arr)   # or xm = min(arr)
         else:
             xm, alpha = fit_pareto(arr)
-        return G_pareto(xm, alpha)
+        return ("pareto", xm, alpha)
 
     # ---- Weibull ----
     if name == "weibull":
         if len(params) >= 2:
             k_shape, lam = params[0], params[1]
         else:
-            # if you don't have a Weibull fit yet, you can plug one in later
-            # for now, just fall back to exponential-like behavior
-            lam = fit_exponential(arr)
-            k_shape = 1.0
-        return G_weibull(k_shape, lam)
+            k_shape, lam = fit_weibull(arr)
+        return ("weibull", k_shape, lam)
 
     # ---- Logistic ----
     if name == "logistic":
@@ -72,7 +70,7 @@ def make_G_from_lkaps(arr, lkaps_result):
             mu, s = params[0], params[1]
         else:
             mu, s = fit_logistic(arr)
-        return G_logistic(mu, s)
+        return ("logistic", mu, s)
 
     # ---- Beta ----
     if name == "beta":
@@ -81,12 +79,28 @@ def make_G_from_lkaps(arr, lkaps_result):
         else:
             # you might want a separate Beta fit; placeholder here
             alpha, beta_ = 2.0, 2.0
-        return G_beta(alpha, beta_)
+        return ("beta", alpha, beta_)
 
     # ---- Zipf / discrete power law ----
-    if name == "zipf":
+    if name in ("zipf", "zipflog"):
         # simplest: log transform proxy
-        return G_zipf_log()
+        return ("zipfLog", 0)
+
+    if name == "zipfpareto":
+        # lkaps keys look like ('zipfpareto', 2.5): alpha with xmin = 1
+        if len(params) >= 2:
+            xmin, alpha = params[0], params[1]
+        elif len(params) == 1:
+            xmin, alpha = 1.0, params[0]
+        else:
+            xmin, alpha = fit_pareto(arr)
+        return ("zipfpareto", xmin, alpha)
+
+    # ---- Empirical CDF ----
+    if name == "ecdf":
+        # ('ecdf', n_knots): knots are resampled from arr itself
+        n_knots = int(params[0]) if len(params) >= 1 else 256
+        return ("ecdf", n_knots)
 
     # ---- Box–Cox ----
     if name == "boxcox":
@@ -94,7 +108,32 @@ def make_G_from_lkaps(arr, lkaps_result):
             lmbd = params[0]
         else:
             lmbd = 0.0
-        return G_boxcox(lmbd)
+        return ("boxcox", lmbd)
 
     # Fallback: if we don't recognize the name, just use identity
-    return G_uniform()
+    return ("uniform", 0)
+
+
+def make_G_from_lkaps(arr, lkaps_result):
+
+    """
+    arr           : the sorted data array you're searching in
+    lkaps_result  : tuple like ('uniform', 0) or ('pareto', 9.9) etc.
+    returns       : a callable G(x) suitable to pass as G_choice into kaps()
+    """
+
+    key = resolve_lkaps_key(arr, lkaps_result)
+    name, params = key[0], key[1:]
+
+    if name == "uniform":     return G_uniform()
+    if name == "normal":      return G_normal(*params)
+    if name == "exponential": return G_exponential(*params)
+    if name == "lognormal":   return G_lognormal(*params)
+    if name == "pareto":      return G_pareto(*params)
+    if name == "weibull":     return G_weibull(*params)
+    if name == "logistic":    return G_logistic(*params)
+    if name == "beta":        return G_beta(*params)
+    if name == "zipfLog":     return G_zipf_log()
+    if name == "zipfpareto":  return G_zipf_pareto_surrogate(*params)
+    if name == "ecdf":        return G_ecdf(arr, *params)
+    if name == "boxcox":      return G_boxcox(*params)
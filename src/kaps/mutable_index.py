@@ -0,0 +1,253 @@
+## Updatable KAPS index: an immutable sorted base searched with DD-KAPS,
+## plus a small sorted delta buffer of inserts and a tombstone set of
+## deletes. Once the buffers pass a threshold they are frozen and merged
+## into a new base on a background thread; lookups keep using the old
+## base until the new one is swapped in. An optional DriftMonitor watches
+## lookup depth and triggers a background refit of G when it degrades.
+
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps, G_uniform
+from .drift import DriftMonitor, fit_depths
+from .l_kaps import lkaps_fit
+from .lkaps_to_gchoice import make_G_from_lkaps
+
+
+class _Version:
+    """Immutable snapshot: base array, its G, and the buffers being merged into it."""
+
+    __slots__ = ("base", "G", "frozen_delta", "frozen_tombs")
+
+    def __init__(self, base, G, frozen_delta=None, frozen_tombs=None):
+        self.base = base
+        self.G = G
+        self.frozen_delta = frozen_delta
+        self.frozen_tombs = frozen_tombs
+
+
+class MutableKapsIndex:
+    """
+    A sorted key set that takes inserts and deletes.
+
+    arr             : initial sorted keys
+    G               : transform for the base; None picks one with `fit`
+    k, divisor      : DD-KAPS settings
+    merge_threshold : buffered inserts + deletes that trigger a merge
+    background      : merge on a thread (True) or inline in the writer (False)
+    fit             : model selection used for G and refits, returning
+                      (lkaps_key, best_value); lkaps_fit by default
+    monitor         : True (or a DriftMonitor) to watch lookup depth and
+                      refit G in the background once it degrades
+
+    Layers are consulted newest first: live delta, live tombstones,
+    frozen delta, frozen tombstones, then the base. Keys have set
+    semantics, so duplicates in the base collapse on the first merge.
+    """
+
+    def __init__(self, arr, G=None, k=20, divisor=2, merge_threshold=4096, background=True,
+                 fit=lkaps_fit, monitor=None):
+        base = np.asarray(arr)
+
+        self.k = k
+        self.divisor = divisor
+        self.merge_threshold = merge_threshold
+        self.background = background
+        self.fit = fit
+
+        self._key = None        # fit key behind the current G (None if G was given)
+        fit_value = None
+        if G is None:
+            self._key, G, fit_value = self._fit_G(base)
+
+        self._lock = threading.Lock()
+        self._delta = []        # sorted live inserts
+        self._tombs = set()     # live deletes
+        self._version = _Version(base, G)
+        self._merge_thread = None
+        self._refit_thread = None
+
+        if monitor is True:
+            monitor = DriftMonitor(fit_depths(base, G, k, divisor), fit_value)
+        elif monitor:
+            monitor.reset(fit_depths(base, G, k, divisor), fit_value)
+        self.monitor = monitor or None
+
+    # ---------- Writes ----------
+    def insert(self, key):
+        with self._lock:
+            self._tombs.discard(key)
+            i = bisect_left(self._delta, key)
+            if i == len(self._delta) or self._delta[i] != key:
+                self._delta.insert(i, key)
+            self._maybe_merge()
+
+    def delete(self, key):
+        with self._lock:
+            i = bisect_left(self._delta, key)
+            if i < len(self._delta) and self._delta[i] == key:
+                del self._delta[i]
+            self._tombs.add(key)
+            self._maybe_merge()
+
+    # ---------- Reads ----------
+    def search(self, key):
+        """Returns (found, depth); depth is the base DD-KAPS depth (0 if a buffer answered)."""
+        with self._lock:
+            i = bisect_left(self._delta, key)
+            if i < len(self._delta) and self._delta[i] == key:
+                return True, 0
+            if key in self._tombs:
+                return False, 0
+            v = self._version
+
+        if v.frozen_delta is not None:
+            j = np.searchsorted(v.frozen_delta, key)
+            if j < v.frozen_delta.size and v.frozen_delta[j] == key:
+                return True, 0
+            if key in v.frozen_tombs:
+                return False, 0
+
+        if v.base.size == 0:
+            return False, 0
+        idx, depth = dd_kaps(0, v.base.size - 1, v.base, key, self.k, self.divisor, v.G)
+
+        m = self.monitor
+        if m is not None and m.record(depth):
+            self._start_refit()
+        return idx >= 0, depth
+
+    def __contains__(self, key):
+        return self.search(key)[0]
+
+    def to_array(self):
+        """Sorted snapshot of every live key."""
+        with self._lock:
+            v = self._version
+            delta = np.asarray(self._delta)
+            tombs = set(self._tombs)
+        if v.frozen_delta is not None:
+            base = _merged(v.base, v.frozen_delta, v.frozen_tombs)
+        else:
+            base = v.base
+        return _merged(base, delta, tombs)
+
+    @property
+    def base(self):
+        return self._version.base
+
+    @property
+    def G(self):
+        return self._version.G
+
+    # ---------- Refitting ----------
+    def refit(self):
+        """
+        Refits G on the current base and swaps it in atomically.
+        Lookups keep the old G until the swap.
+
+        The new G is only kept if the fit picked a different model and it
+        lowers the mean depth on the sampled keys; otherwise the old G
+        stays and the monitor accepts the current depth as its baseline,
+        so an unchanged fit doesn't trigger the same refit over and over.
+        Returns True when G was replaced.
+        """
+        v = self._version
+        key, G, fit_value = self._fit_G(v.base)
+        baseline = fit_depths(v.base, G, self.k, self.divisor)
+
+        improved = key != self._key and (
+            np.mean(baseline) < np.mean(fit_depths(v.base, v.G, self.k, self.divisor)))
+        if improved:
+            with self._lock:
+                v = self._version
+                self._version = _Version(v.base, G, v.frozen_delta, v.frozen_tombs)
+                self._key = key
+
+        if self.monitor is not None:
+            if improved:
+                self.monitor.reset(baseline, fit_value)
+            else:
+                self.monitor.accept(fit_value)
+        return improved
+
+    def wait_refit(self):
+        """Blocks until a background refit has swapped in its G."""
+        t = self._refit_thread
+        if t is not None:
+            t.join()
+
+    def _start_refit(self):
+        with self._lock:
+            t = self._refit_thread
+            if t is not None and t.is_alive():
+                return
+            self._refit_thread = threading.Thread(target=self.refit, daemon=True)
+            self._refit_thread.start()
+
+    def _fit_G(self, arr):
+        if arr.size < 2:
+            return ("uniform", 0), G_uniform(), None
+        key, value = self.fit(arr)
+        return key, make_G_from_lkaps(arr, key), value
+
+    # ---------- Merging ----------
+    def merge(self):
+        """Starts a merge now (if one isn't running) and waits for it."""
+        with self._lock:
+            self._start_merge()
+        self.wait()
+
+    def wait(self):
+        """Blocks until background merges (including chained ones) have finished."""
+        while True:
+            t = self._merge_thread
+            if t is None or t is threading.current_thread():
+                return
+            t.join()
+            if self._merge_thread is t:
+                return
+
+    def _maybe_merge(self):
+        # caller holds the lock
+        if len(self._delta) + len(self._tombs) >= self.merge_threshold:
+            self._start_merge()
+
+    def _start_merge(self):
+        # caller holds the lock
+        if self._version.frozen_delta is not None:
+            return   # one merge at a time; the next starts when it finishes
+        if not self._delta and not self._tombs:
+            return
+
+        old = self._version
+        v = _Version(old.base, old.G, np.asarray(self._delta), self._tombs)
+        self._delta, self._tombs = [], set()
+        self._version = v
+
+        if self.background:
+            self._merge_thread = threading.Thread(target=self._merge, args=(v,), daemon=True)
+            self._merge_thread.start()
+        else:
+            self._finish_merge(_merged(v.base, v.frozen_delta, v.frozen_tombs))
+
+    def _merge(self, v):
+        new_base = _merged(v.base, v.frozen_delta, v.frozen_tombs)
+        with self._lock:
+            self._finish_merge(new_base)
+
+    def _finish_merge(self, new_base):
+        # caller holds the lock; keep whatever G is current (it may have been refit)
+        self._version = _Version(new_base, self._version.G)
+        self._maybe_merge()
+
+
+def _merged(base, delta, tombs):
+    if tombs:
+        base = base[~np.isin(base, np.array(list(tombs)))]
+    if delta.size:
+        return np.union1d(base, delta)
+    return base
+
@@ -0,0 +1,165 @@
+## Range queries on top of the KAPS descent: lower/upper bound
+## (insertion positions, like bisect_left/bisect_right) and a range
+## scan that returns the matching slice or streams it in chunks.
+
+import numpy as np
+
+from .dd_kaps import G_uniform, interp_pos, apply_G
+
+
+def _bound(arr, target, right, k, divisor, G, lo, hi):
+    """
+    Predictive k-ary descent for an insertion position in arr[lo:hi].
+    right=False → first i with arr[i] >= target (bisect_left)
+    right=True  → first i with arr[i] >  target (bisect_right)
+    Returns (position, depth).
+    """
+    if hi is None:
+        hi = len(arr)
+    if lo >= hi:
+        return lo, 0
+    if G is None:
+        G = G_uniform()
+
+    # "x belongs before the insertion point"
+    if right:
+        before = lambda x: x <= target
+    else:
+        before = lambda x: x < target
+
+    # Fast answers at the window edges
+    depth = 1
+    if not before(arr[lo]):
+        return lo, depth
+    if before(arr[hi - 1]):
+        return hi, depth
+
+    # Invariant: arr[L] is before target, arr[H] is not → answer in (L, H]
+    L, H = lo, hi - 1
+    while H - L > 1:
+        depth += 1
+
+        # Avoid over-partitioning; k >= 2 so every step shrinks the window
+        if H - L <= k:
+            k = max(2, k // max(1, divisor))
+
+        # Interpolation step in transformed space, bucket clamped to [0, k-1]
+        # (a NaN position from a saturated G falls into bucket 0)
+        pos = interp_pos(arr, L, H, target, k, G)
+        b = int(pos) if 0 < pos < k else (k - 1 if pos >= k else 0)
+
+        span = H - L
+        subLo = L + (span * b) // k
+        subHi = L + (span * (b + 1)) // k
+
+        if not before(arr[subLo]):
+            H = subLo                  # answer left of the bucket
+        elif before(arr[subHi]):
+            L = subHi                  # answer right of the bucket
+        else:
+            L, H = subLo, subHi        # answer inside the bucket
+
+    return H, depth
+
+
+def kaps_bound_batch(arr, values, side="left", k=20, divisor=2, G=None):
+    """
+    Vectorized _bound over the whole arr: every value descends in
+    lockstep, one NumPy pass per level. Returns (position, depth)
+    int arrays shaped like `values`.
+    """
+    arr = np.asarray(arr)
+    values = np.asarray(values)
+    shape = values.shape
+    t = values.ravel()
+    n = arr.size
+    if G is None:
+        G = G_uniform()
+
+    out = np.zeros(t.size, dtype=np.intp)
+    depth = np.zeros(t.size, dtype=np.intp)
+    if n == 0 or t.size == 0:
+        return out.reshape(shape), depth.reshape(shape)
+
+    if side == "right":
+        before = np.less_equal
+    else:
+        before = np.less
+
+    # Fast answers at the window edges
+    depth[:] = 1
+    at_lo = ~before(arr[0], t)
+    at_hi = ~at_lo & before(arr[-1], t)
+    out[at_hi] = n
+
+    ids = np.flatnonzero(~(at_lo | at_hi))
+    t = t[ids]
+    Gt = apply_G(G, t)
+    L = np.zeros(ids.size, dtype=np.intp)
+    H = np.full(ids.size, n - 1, dtype=np.intp)
+    kk = np.full(ids.size, k, dtype=np.intp)
+    div = max(1, divisor)
+
+    # Invariant per value: arr[L] is before it, arr[H] is not
+    while ids.size:
+        done = H - L <= 1
+        out[ids[done]] = H[done]
+        live = ~done
+        ids, t, Gt, L, H, kk = ids[live], t[live], Gt[live], L[live], H[live], kk[live]
+        if not ids.size:
+            break
+
+        depth[ids] += 1
+        kk = np.where(H - L <= kk, np.maximum(2, kk // div), kk)
+
+        Ga = apply_G(G, arr[L])
+        denom = apply_G(G, arr[H]) - Ga
+        flat_G = denom == 0
+        with np.errstate(invalid="ignore"):
+            pos = np.where(flat_G, (kk - 1) / 2.0, kk * (Gt - Ga) / np.where(flat_G, 1.0, denom))
+        b = np.clip(np.nan_to_num(np.floor(pos), nan=0.0), 0, kk - 1).astype(np.intp)
+
+        span = H - L
+        subLo = L + (span * b) // kk
+        subHi = L + (span * (b + 1)) // kk
+
+        go_left = ~before(arr[subLo], t)
+        go_right = ~go_left & before(arr[subHi], t)
+        inside = ~(go_left | go_right)
+
+        H = np.where(go_left, subLo, np.where(inside, subHi, H))
+        L = np.where(go_right, subHi, np.where(inside, subLo, L))
+
+    return out.reshape(shape), depth.reshape(shape)
+
+
+def kaps_lower_bound(arr, target, k=20, divisor=2, G=None, lo=0, hi=None):
+    """First position i in arr[lo:hi] with arr[i] >= target; returns (i, depth)."""
+    return _bound(arr, target, False, k, divisor, G, lo, hi)
+
+
+def kaps_upper_bound(arr, target, k=20, divisor=2, G=None, lo=0, hi=None):
+    """First position i in arr[lo:hi] with arr[i] > target; returns (i, depth)."""
+    return _bound(arr, target, True, k, divisor, G, lo, hi)
+
+
+def kaps_range(arr, a, b, k=20, divisor=2, G=None, chunk_size=None):
+    """
+    All keys in [a, b].
+
+    chunk_size=None returns arr[start:stop] (a zero-copy view for
+    ndarrays); otherwise returns a generator of slices of at most
+    chunk_size keys each.
+    """
+    start, _ = kaps_lower_bound(arr, a, k, divisor, G)
+    stop, _ = kaps_upper_bound(arr, b, k, divisor, G, lo=start)
+    stop = max(start, stop)
+
+    if chunk_size is None:
+        return arr[start:stop]
+    return _chunks(arr, start, stop, chunk_size)
+
+
+def _chunks(arr, start, stop, chunk_size):
+    for i in range(start, stop, chunk_size):
+        yield arr[i:min(i + chunk_size, stop)]
@@ -0,0 +1,79 @@
+## numpy.searchsorted-compatible front end for the KAPS descent, so
+## existing code can switch with a one-line change.
+
+import numpy as np
+
+from .range_scan import kaps_bound_batch
+from .lkaps_to_gchoice import make_G_from_lkaps
+
+
+def searchsorted(arr, values, side="left", model=None, k=20, divisor=2):
+    """
+    Same result as np.searchsorted(arr, values, side) for numeric arr,
+    including duplicates, missing values and NaN (sorted last).
+
+    model : None  → fit one with lkaps_fit (closed form, milliseconds)
+            a G callable, or an L-KAPS key such as lkaps(arr)[0]
+    Pass a model when calling repeatedly on the same array, to skip the fit.
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side must be 'left' or 'right', got {side!r}")
+    arr = np.asarray(arr)
+    if arr.ndim != 1:
+        raise ValueError("arr must be 1-D")
+    if arr.dtype.kind not in "biuf":
+        raise TypeError(f"kaps.searchsorted only supports numeric keys, got {arr.dtype}")
+
+    scalar = np.ndim(values) == 0
+    values = np.asarray(values)
+    n = arr.size
+
+    # NumPy sorts NaN after every number: search only the numeric prefix
+    n_num = _numeric_prefix(arr)
+    G = _model_to_G(arr[:n_num], model)
+
+    out, _ = kaps_bound_batch(arr[:n_num], values, side, k, divisor, G)
+
+    if values.dtype.kind in "fc":
+        nan = np.isnan(values)
+        if nan.any():
+            out[nan] = n_num if side == "left" else n
+
+    if scalar:
+        return np.intp(out)
+    return out
+
+
+def _numeric_prefix(arr):
+    # Count of leading non-NaN keys (NaNs, if any, are all at the end)
+    n = arr.size
+    if arr.dtype.kind != "f" or n == 0 or not np.isnan(arr[-1]):
+        return n
+    lo, hi = 0, n - 1          # arr[hi] is NaN
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if np.isnan(arr[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _model_to_G(arr, model):
+    # None (uniform G) whenever there is nothing to fit or the fit fails:
+    # the descent is still exact, only slower
+    if callable(model):
+        return model
+    if model is None:
+        finite = arr[np.isfinite(arr)] if arr.dtype.kind == "f" else arr
+        if finite.size < 2 or finite[0] == finite[-1]:
+            return None
+        from .l_kaps import lkaps_fit
+        try:
+            model = lkaps_fit(finite)[0]
+        except (ArithmeticError, ValueError):
+            return None
+    try:
+        return make_G_from_lkaps(arr, model)
+    except (ArithmeticError, ValueError):
+        return None
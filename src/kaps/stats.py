@@ -0,0 +1,187 @@
+## Search instrumentation: per-query latency, array probes, G evaluations,
+## bucket fallbacks and terminal scans, aggregated into percentiles and
+## log2 histograms. The engines themselves only take an optional `stats`
+## hook on their widening branches and terminal scan; everything else is
+## counted from outside, so a search without a collector pays nothing.
+
+import time
+
+import numpy as np
+
+from .dd_kaps import kaps as _dd_kaps
+from .base_kaps import kaps as _base_kaps
+from .baselines import binary_search as _binary_search
+from .baselines import interpolation_search as _interpolation_search
+from .baselines import interpolation_sequential_search as _interpolation_sequential_search
+from .baselines import exponential_search as _exponential_search
+
+FIELDS = ("ns", "depth", "probes", "G_calls", "fallbacks", "scan_probes")
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class _CountingArray:
+    """Read-only view of arr that counts element reads into stats."""
+
+    __slots__ = ("_arr", "_stats")
+
+    def __init__(self, arr, stats):
+        self._arr = arr
+        self._stats = stats
+
+    def __getitem__(self, i):
+        self._stats._probes += 1
+        return self._arr[i]
+
+    def __len__(self):
+        return len(self._arr)
+
+
+class SearchStats:
+    """
+    Collector for search telemetry.
+
+    Call the search through the collector instead of directly:
+
+        stats = SearchStats()
+        idx, depth = stats.dd_kaps(0, n - 1, arr, target, 20, 2, G)
+        stats.summary()
+
+    (base_kaps and every baseline in kaps.baselines work the same way.)
+
+    Each query is run twice: once untouched, timed with perf_counter_ns,
+    and once on counting proxies of arr and G for probes, G calls,
+    fallbacks (the target < arr[subLo] / target > arr[subHi] widening
+    branches) and the probes spent in the terminal scan.
+    count=False skips the second run and records latency and depth only.
+    """
+
+    def __init__(self, count=True):
+        self.count = count
+        self.reset()
+
+    def reset(self):
+        self._rows = {f: [] for f in FIELDS}
+        self._begin()
+
+    def __len__(self):
+        return len(self._rows["ns"])
+
+    # ---------- Engine hooks ----------
+    def on_fallback(self):
+        self._fallbacks += 1
+
+    def on_scan(self):
+        self._scan_from = self._probes
+
+    # ---------- Instrumented searches ----------
+    def dd_kaps(self, lo, hi, arr, target, k, divisor, G_choice, G_arr=None,
+                cutoff=1, scan="linear", guard=None):
+        def plain():
+            return _dd_kaps(lo, hi, arr, target, k, divisor, G_choice, G_arr,
+                            cutoff=cutoff, scan=scan, guard=guard)
+
+        def counted():
+            return _dd_kaps(lo, hi, _CountingArray(arr, self), target, k, divisor,
+                            self._counting_G(G_choice), G_arr, stats=self,
+                            cutoff=cutoff, scan=scan, guard=guard)
+
+        return self._run(plain, counted)
+
+    def base_kaps(self, lo, hi, arr, target, k, divisor):
+        def plain():
+            return _base_kaps(lo, hi, arr, target, k, divisor)
+
+        def counted():
+            return _base_kaps(lo, hi, _CountingArray(arr, self), target, k, divisor, stats=self)
+
+        return self._run(plain, counted)
+
+    def binary_search(self, arr, lo, hi, x):
+        return self._run(lambda: _binary_search(arr, lo, hi, x),
+                         lambda: _binary_search(_CountingArray(arr, self), lo, hi, x))
+
+    def interpolation_search(self, arr, lo, hi, x, max_depth=998):
+        return self._run(lambda: _interpolation_search(arr, lo, hi, x, max_depth),
+                         lambda: _interpolation_search(_CountingArray(arr, self), lo, hi, x, max_depth))
+
+    def interpolation_sequential_search(self, arr, lo, hi, x):
+        return self._run(lambda: _interpolation_sequential_search(arr, lo, hi, x),
+                         lambda: _interpolation_sequential_search(_CountingArray(arr, self), lo, hi, x))
+
+    def exponential_search(self, arr, lo, hi, x):
+        return self._run(lambda: _exponential_search(arr, lo, hi, x),
+                         lambda: _exponential_search(_CountingArray(arr, self), lo, hi, x))
+
+    def _counting_G(self, G):
+        def counted_G(x):
+            self._G_calls += 1
+            return G(x)
+        return counted_G
+
+    def _begin(self):
+        self._probes = 0
+        self._G_calls = 0
+        self._fallbacks = 0
+        self._scan_from = None
+
+    def _run(self, plain, counted):
+        start = time.perf_counter_ns()
+        result = plain()
+        ns = time.perf_counter_ns() - start
+
+        row = self._rows
+        row["ns"].append(ns)
+        row["depth"].append(result[1])
+        if self.count:
+            self._begin()
+            counted()
+            row["probes"].append(self._probes)
+            row["G_calls"].append(self._G_calls)
+            row["fallbacks"].append(self._fallbacks)
+            scan = 0 if self._scan_from is None else self._probes - self._scan_from
+            row["scan_probes"].append(scan)
+        return result
+
+    # ---------- Aggregation ----------
+    def values(self, field):
+        """Per-query values of one field, as an int64 array."""
+        return np.asarray(self._rows[field], dtype=np.int64)
+
+    def percentiles(self, field, q=PERCENTILES):
+        v = self.values(field)
+        if v.size == 0:
+            return {p: 0.0 for p in q}
+        return dict(zip(q, np.percentile(v, q).tolist()))
+
+    def histogram(self, field="ns"):
+        """
+        Log2 histogram: {upper_bound: count}, where bucket b holds the
+        values in [2**(b-1), 2**b) and 0 counts as its own bucket.
+        """
+        v = self.values(field)
+        if v.size == 0:
+            return {}
+        b = np.zeros(v.size, dtype=np.int64)
+        pos = v > 0
+        b[pos] = np.floor(np.log2(v[pos])).astype(np.int64) + 1
+        counts = np.bincount(b)
+        return {(0 if i == 0 else 1 << i): int(c) for i, c in enumerate(counts) if c}
+
+    def summary(self, q=PERCENTILES):
+        """Totals, per-query means and percentiles for every recorded field."""
+        out = {"queries": len(self)}
+        for field in FIELDS:
+            v = self.values(field)
+            if v.size == 0:
+                continue
+            out[field] = {
+                "total": int(v.sum()),
+                "mean": float(v.mean()),
+                "max": int(v.max()),
+                "percentiles": self.percentiles(field, q),
+            }
+        if self.count and len(self):
+            probes = self.values("probes").sum()
+            out["scan_share"] = float(self.values("scan_probes").sum() / probes) if probes else 0.0
+            out["fallback_rate"] = float(np.mean(self.values("fallbacks") > 0))
+        return out
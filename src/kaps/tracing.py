@@ -0,0 +1,105 @@
+## Per-level traces of the DD-KAPS descent and their aggregation:
+## how much each level shrinks the window, and which parts of the key
+## space make the fitted G pick the wrong bucket.
+
+import numpy as np
+
+from .dd_kaps import kaps as dd_kaps, G_uniform
+
+TRACE_FIELDS = ("level", "lo", "hi", "pos", "bucket", "subLo", "subHi", "branch")
+
+
+class TraceRecorder:
+    """
+    Tracer for dd_kaps that keeps every step it is shown.
+
+        rec = TraceRecorder()
+        dd_kaps(0, n - 1, arr, target, 20, 2, G, tracer=rec)
+        rec.steps   # [(level, lo, hi, pos, bucket, subLo, subHi, branch), ...]
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def __call__(self, level, lo, hi, pos, bucket, subLo, subHi, branch):
+        self.steps.append((level, lo, hi, pos, bucket, subLo, subHi, branch))
+
+    def as_dicts(self):
+        return [dict(zip(TRACE_FIELDS, step)) for step in self.steps]
+
+
+def trace_queries(arr, targets, k=20, divisor=2, G=None, G_arr=None):
+    """
+    Runs dd_kaps on every target with a fresh TraceRecorder.
+
+    Returns a list of (target, index, depth, steps), one per target.
+    """
+    if G is None:
+        G = G_uniform()
+    n = len(arr)
+    traces = []
+    for t in targets:
+        rec = TraceRecorder()
+        idx, depth = dd_kaps(0, n - 1, arr, t, k, divisor, G, G_arr, tracer=rec)
+        traces.append((t, idx, depth, rec.steps))
+    return traces
+
+
+def summarize_traces(traces, n_regions=16, flag_ratio=1.25):
+    """
+    Aggregates trace_queries output.
+
+    levels  : per level, how many queries reached it, the mean and p90
+              shrink ratio (kept window / window, lower is better) and
+              the mispredict rate (share of steps whose branch was
+              "left"/"right", i.e. the target missed G's bucket)
+    regions : targets split into n_regions equal-count slices of the key
+              space; per slice the key range, mean depth and mispredict
+              rate, with flagged=True where the rate is more than
+              flag_ratio times the overall rate
+    mispredict_rate : the overall rate, over every step of every query
+    """
+    levels = {}
+    per_query = []
+    for target, _, depth, steps in traces:
+        missed = 0
+        for level, lo, hi, _, _, subLo, subHi, branch in steps:
+            shrink = (subHi - subLo) / (hi - lo)
+            miss = branch in ("left", "right")
+            missed += miss
+            levels.setdefault(level, ([], []))
+            levels[level][0].append(shrink)
+            levels[level][1].append(miss)
+        per_query.append((target, depth, missed, len(steps)))
+
+    level_rows = []
+    for level in sorted(levels):
+        shrink, miss = np.asarray(levels[level][0]), np.asarray(levels[level][1])
+        level_rows.append({
+            "level": level,
+            "count": int(shrink.size),
+            "mean_shrink": float(shrink.mean()),
+            "p90_shrink": float(np.percentile(shrink, 90)),
+            "mispredict_rate": float(miss.mean()),
+        })
+
+    total_steps = sum(q[3] for q in per_query)
+    overall = sum(q[2] for q in per_query) / total_steps if total_steps else 0.0
+
+    region_rows = []
+    if per_query:
+        per_query.sort(key=lambda q: q[0])
+        for chunk in np.array_split(np.arange(len(per_query)), min(n_regions, len(per_query))):
+            rows = [per_query[i] for i in chunk]
+            steps = sum(r[3] for r in rows)
+            rate = sum(r[2] for r in rows) / steps if steps else 0.0
+            region_rows.append({
+                "lo_key": rows[0][0],
+                "hi_key": rows[-1][0],
+                "queries": len(rows),
+                "mean_depth": float(np.mean([r[1] for r in rows])),
+                "mispredict_rate": rate,
+                "flagged": rate > flag_ratio * overall,
+            })
+
+    return {"levels": level_rows, "regions": region_rows, "mispredict_rate": overall}
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from kaps import dd_kaps, dd_kaps_batch
+from kaps.baselines import (
+    binary_search, interpolation_search, interpolation_sequential_search, exponential_search,
+    binary_search_batch, interpolation_search_batch, interpolation_sequential_search_batch,
+    exponential_search_batch,
+)
+from kaps.dd_kaps import G_uniform, G_normal, G_ecdf, apply_G
+
+N = 2000
+
+
+def _arrays():
+    rng = np.random.default_rng(0)
+    return {
+        "uniform": np.sort(rng.uniform(0, 1e6, N)),
+        "normal": np.sort(rng.normal(0, 1, N)),
+        "lognormal": np.sort(rng.lognormal(0, 2, N)),
+        "zipf": np.sort(np.minimum(rng.zipf(2.0, N), 10**6)).astype(np.float64),
+        "exp_spaced": np.exp(np.linspace(0, 60, N)),
+    }
+
+
+ARRAYS = _arrays()
+
+
+def _scalar_only(G):
+    # Parity is exact only when both paths see the same G values; the
+    # vectorized erf can differ from math.erf in the last bit
+    return lambda x: G(x)
+
+
+MODELS = {
+    "uniform": lambda arr: G_uniform(),
+    "normal": lambda arr: _scalar_only(G_normal(arr.mean(), arr.std())),
+    "ecdf": lambda arr: G_ecdf(arr),
+}
+
+
+def _targets(arr):
+    rng = np.random.default_rng(1)
+    present = arr[rng.integers(0, arr.size, 150)]
+    absent = rng.uniform(arr[0], arr[-1], 50)
+    return np.concatenate([present, absent, [arr[0] - 1, arr[-1] + 1]])
+
+
+@pytest.mark.parametrize("name", ARRAYS)
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"cutoff": 8},
+    {"cutoff": 8, "scan": "bisect"},
+    {"cutoff": 32, "scan": "searchsorted"},
+    {"guard": 0.5},
+    {"cutoff": 16, "guard": 0.5},
+])
+@pytest.mark.parametrize("cached", [False, True])
+def test_dd_kaps_batch_matches_scalar(name, model, kwargs, cached):
+    arr = ARRAYS[name]
+    G = MODELS[model](arr)
+    G_arr = apply_G(G, arr) if cached else None
+    targets = _targets(arr)
+
+    idx, depth = dd_kaps_batch(arr, targets, 20, 2, G, G_arr=G_arr, **kwargs)
+    expected = [dd_kaps(0, arr.size - 1, arr, t, 20, 2, G, G_arr, **kwargs) for t in targets]
+    assert list(zip(idx.tolist(), depth.tolist())) == expected
+
+
+@pytest.mark.parametrize("name", ARRAYS)
+@pytest.mark.parametrize("scalar, batch", [
+    (binary_search, binary_search_batch),
+    (interpolation_search, interpolation_search_batch),
+    (interpolation_sequential_search, interpolation_sequential_search_batch),
+    (exponential_search, exponential_search_batch),
+])
+def test_baseline_batch_matches_scalar(name, scalar, batch):
+    arr = ARRAYS[name]
+    targets = _targets(arr)
+
+    idx, depth = batch(arr, targets)
+    expected = [scalar(arr, 0, arr.size - 1, t) for t in targets]
+    assert list(zip(idx.tolist(), depth.tolist())) == expected
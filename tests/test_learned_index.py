@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from kaps import LearnedIndex
+from kaps.dd_kaps import G_logistic, G_uniform
+
+
+@pytest.fixture(scope="module", params=["fitted", "logistic", "uniform"])
+def index(request):
+    arr = np.sort(np.random.default_rng(0).normal(0, 1, 5000))
+    G = {"fitted": None, "logistic": G_logistic(0, 1), "uniform": G_uniform()}[request.param]
+    return LearnedIndex(arr, G)
+
+
+@pytest.mark.parametrize("target", [np.inf, -np.inf, np.nan, 1e300, -1e300])
+def test_search_rejects_out_of_range(index, target):
+    assert index.search(target) == (-1, 1)
+
+
+@pytest.mark.parametrize("target", [np.inf, -np.inf, np.nan, 1e300, -1e300])
+def test_search_batch_rejects_out_of_range(index, target):
+    idx, depth = index.search_batch([target, index.arr[17]])
+    assert idx[0] == -1 and depth[0] == 1
+    assert idx[1] == 17 or index.arr[idx[1]] == index.arr[17]
+
+
+def test_batch_matches_scalar(index):
+    rng = np.random.default_rng(1)
+    targets = np.concatenate([index.arr[rng.integers(0, index.arr.size, 300)],
+                              rng.normal(0, 2, 100), [np.inf, -np.inf, np.nan]])
+    idx, _ = index.search_batch(targets)
+    assert idx.tolist() == [index.search(t)[0] for t in targets]
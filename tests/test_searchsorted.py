@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+import kaps
+
+
+@pytest.mark.parametrize("arr, values", [
+    (np.array([5, 5]), [4, 5, 6]),
+    (np.zeros(100), [-1.0, 0.0, 1.0]),
+    (np.array([3.0]), [1.0, 3.0, 4.0]),
+    (np.array([1.0, 2.0, 3.0, np.inf]), [-np.inf, 2.0, 5.0, np.inf]),
+    (np.array([-np.inf, 1.0, 2.0, 3.0]), [-np.inf, 2.0, 9.0]),
+    (np.array([1.0, 1.0, np.nan]), [1.0, np.nan]),
+])
+@pytest.mark.parametrize("side", ["left", "right"])
+def test_degenerate_arrays_match_numpy(arr, values, side):
+    np.testing.assert_array_equal(kaps.searchsorted(arr, values, side=side),
+                                  np.searchsorted(arr, values, side=side))